@@ -231,8 +231,8 @@ class RainforestResinStrategy(MarketMakingStrategy):
 
     def get_true_value(self, state: TradingState) -> int:
         order_depth = state.order_depths[self.symbol]
-        best_bid = max(order_depth.buy_orders.keys(), default=None)
-        best_ask = min(order_depth.sell_orders.keys(), default=None)
+        best_bid = max(order_depth.buy_orders, default=None)
+        best_ask = min(order_depth.sell_orders, default=None)
         mid_price = (best_bid + best_ask) / 2 if best_bid and best_ask else best_bid or best_ask
 
         return 10_000
@@ -248,8 +248,8 @@ class KelpStrategy(MarketMakingStrategy):
 
     def get_true_value(self, state: TradingState) -> int:
         order_depth = state.order_depths[self.symbol]
-        best_bid = max(order_depth.buy_orders.keys(), default=None)
-        best_ask = min(order_depth.sell_orders.keys(), default=None)
+        best_bid = max(order_depth.buy_orders, default=None)
+        best_ask = min(order_depth.sell_orders, default=None)
         mid_price = (best_bid + best_ask) / 2 if best_bid and best_ask else best_bid or best_ask
 
         self.short_prices.append(mid_price)
@@ -280,8 +280,8 @@ class SquidInkStrategy(MarketMakingStrategy):
 
     def get_true_value(self, state: TradingState) -> int:
         order_depth = state.order_depths[self.symbol]
-        best_bid = max(order_depth.buy_orders.keys(), default=None)
-        best_ask = min(order_depth.sell_orders.keys(), default=None)
+        best_bid = max(order_depth.buy_orders, default=None)
+        best_ask = min(order_depth.sell_orders, default=None)
         mid_price = (best_bid + best_ask) / 2 if best_bid and best_ask else best_bid or best_ask
 
         self.short_prices.append(mid_price)
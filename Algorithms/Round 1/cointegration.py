@@ -1,20 +1,82 @@
 import json
 
 from datamodel import TradingState, Order
-from typing import List 
+from typing import List
+
+DEBUG = False  # gate per-tick prints: f-strings are only built when enabled
+
+# EMA smoothing factors with precomputed complements; CPython does not
+# constant-fold (1 - alpha) when alpha is a local
+_A_SPREAD = 0.1
+_MA_SPREAD = 0.9
+_A_RESIN = 0.1
+_MA_RESIN = 0.9
+
+
+def _ema(x, prev, a, ma):
+    # Exponential moving average step, kept as a tiny module-level kernel so
+    # the hot loop works on locals only; ma is the precomputed (1 - a).
+    return a * x + ma * prev
+
+
+def _update_spread_stats(spread, mean, var):
+    # One fused pass over the EMA spread statistics: updated mean, updated
+    # variance, guarded std and the resulting z-score.
+    new_mean = _A_SPREAD * spread + _MA_SPREAD * mean
+    new_var = _A_SPREAD * ((spread - new_mean) ** 2) + _MA_SPREAD * var
+    std = new_var ** 0.5 if new_var > 0 else 1.0  # avoid division by zero
+    z_score = (spread - new_mean) / std
+    return new_mean, new_var, std, z_score
+
+
+def _mid_price(best_bid, best_ask):
+    # Mid price from whichever book sides are present; the common two-sided
+    # path is a single add and multiply.
+    if best_bid is not None:
+        if best_ask is not None:
+            return (best_bid + best_ask) * 0.5
+        return best_bid * 1.01
+    if best_ask is not None:
+        return best_ask * 0.99
+    return None
+
+def _best_bid_ask(order_depth):
+    # Single O(n) pass per side, iterating the dict directly instead of going
+    # through a keys() view; callers keep the results in locals so each book
+    # is scanned at most once per tick.
+    best_bid = max(order_depth.buy_orders) if order_depth.buy_orders else None
+    best_ask = min(order_depth.sell_orders) if order_depth.sell_orders else None
+    return best_bid, best_ask
+
 
 class Trader:
+    def __init__(self):
+        # Resident copy of traderData so the hot path only pays for
+        # json.loads on a cold start (fresh process) and for json.dumps on
+        # ticks that actually mutate the state.
+        self._state = None
+        self._state_json = ""
+
     def run(self, state: TradingState):
-        result = {}
+        # Preallocate one empty order list per product up front; no key
+        # checks or setdefault calls are needed later
+        result = {product: [] for product in state.order_depths}
         max_position = 50  # Position limit per product
-
-        # Load previous state from traderData (if available)
-        try:
-            trader_data = json.loads(state.traderData) if state.traderData else {}
-        except Exception:
-            trader_data = {}
+        # Bind the position lookup once; every later access is a plain local call
+        get_position = state.position.get
+
+        # Load previous state from traderData only on a cold start
+        if self._state is None:
+            try:
+                self._state = json.loads(state.traderData) if state.traderData else {}
+            except Exception:
+                self._state = {}
+            self._state_json = state.traderData or ""
+        trader_data = self._state
+        state_dirty = False
 
         pair_trading_executed = False
+        mid_cache = {}
 
         # ================================
         # Pair Trading Logic for KELP and SQUID_INK
@@ -24,28 +86,17 @@ class Trader:
             squid_depth = state.order_depths["SQUID_INK"]
 
             # Compute mid-price for KELP
-            best_ask_kelp = min(kelp_depth.sell_orders.keys(), default=None)
-            best_bid_kelp = max(kelp_depth.buy_orders.keys(), default=None)
-            if best_ask_kelp is not None and best_bid_kelp is not None:
-                mid_price_kelp = (best_bid_kelp + best_ask_kelp) / 2
-            elif best_ask_kelp is not None:
-                mid_price_kelp = best_ask_kelp * 0.99
-            elif best_bid_kelp is not None:
-                mid_price_kelp = best_bid_kelp * 1.01
-            else:
-                mid_price_kelp = None
+            best_bid_kelp, best_ask_kelp = _best_bid_ask(kelp_depth)
+            mid_price_kelp = _mid_price(best_bid_kelp, best_ask_kelp)
 
             # Compute mid-price for SQUID_INK
-            best_ask_squid = min(squid_depth.sell_orders.keys(), default=None)
-            best_bid_squid = max(squid_depth.buy_orders.keys(), default=None)
-            if best_ask_squid is not None and best_bid_squid is not None:
-                mid_price_squid = (best_bid_squid + best_ask_squid) / 2
-            elif best_ask_squid is not None:
-                mid_price_squid = best_ask_squid * 0.99
-            elif best_bid_squid is not None:
-                mid_price_squid = best_bid_squid * 1.01
-            else:
-                mid_price_squid = None
+            best_bid_squid, best_ask_squid = _best_bid_ask(squid_depth)
+            mid_price_squid = _mid_price(best_bid_squid, best_ask_squid)
+
+            # Cache the mids so the per-product loop below does not
+            # recompute them when pair trading does not execute
+            mid_cache["KELP"] = mid_price_kelp
+            mid_cache["SQUID_INK"] = mid_price_squid
 
             if mid_price_kelp is not None and mid_price_squid is not None:
                 spread = mid_price_kelp - mid_price_squid
@@ -53,58 +104,65 @@ class Trader:
                 # Retrieve historical pair data; if not present, initialize with current spread
                 pair_key = "KELP_SQUID_PAIR"
                 pair_data = trader_data.get(pair_key, {"spread_mean": spread, "spread_var": 0.0})
-                alpha_spread = 0.1
-                new_spread_mean = alpha_spread * spread + (1 - alpha_spread) * pair_data["spread_mean"]
-                new_spread_var = alpha_spread * ((spread - new_spread_mean) ** 2) + (1 - alpha_spread) * pair_data["spread_var"]
-                spread_std = new_spread_var ** 0.5 if new_spread_var > 0 else 1.0  # avoid division by zero
-                z_score = (spread - new_spread_mean) / spread_std
+                new_spread_mean, new_spread_var, spread_std, z_score = _update_spread_stats(
+                    spread, pair_data["spread_mean"], pair_data["spread_var"])
 
-                print(f"[Time {state.timestamp}] Pair Trading: KELP-SQUID_INK Spread: {spread:.2f}, Mean: {new_spread_mean:.2f}, Std: {spread_std:.2f}, Z-Score: {z_score:.2f}")
+                if DEBUG:
+                    print(f"[Time {state.timestamp}] Pair Trading: KELP-SQUID_INK Spread: {spread:.2f}, Mean: {new_spread_mean:.2f}, Std: {spread_std:.2f}, Z-Score: {z_score:.2f}")
 
                 # Save updated pair data
                 trader_data[pair_key] = {"spread_mean": new_spread_mean, "spread_var": new_spread_var}
+                state_dirty = True
 
                 threshold = 1.0
-                # Ensure result has keys for both products
-                result.setdefault("KELP", [])
-                result.setdefault("SQUID_INK", [])
+
+                # Resolve the top-of-book volumes once; the trade branches
+                # below reuse the locals instead of re-hashing the dicts
+                kelp_bid_size = kelp_depth.buy_orders[best_bid_kelp] if best_bid_kelp is not None else 0
+                kelp_ask_size = -kelp_depth.sell_orders[best_ask_kelp] if best_ask_kelp is not None else 0
+                squid_bid_size = squid_depth.buy_orders[best_bid_squid] if best_bid_squid is not None else 0
+                squid_ask_size = -squid_depth.sell_orders[best_ask_squid] if best_ask_squid is not None else 0
 
                 # If the Z-score is high: short KELP and go long on SQUID_INK
                 if z_score > threshold:
                     # For KELP: Short
-                    current_position_kelp = state.position.get("KELP", 0)
+                    current_position_kelp = get_position("KELP", 0)
                     available_sell_kelp = max_position + current_position_kelp
                     if best_bid_kelp is not None and available_sell_kelp > 0:
-                        order_size = min(available_sell_kelp, kelp_depth.buy_orders[best_bid_kelp])
+                        order_size = min(available_sell_kelp, kelp_bid_size)
                         if order_size > 0:
                             result["KELP"].append(Order("KELP", best_bid_kelp, -order_size))
-                            print(f"--> Pair Trading: Shorting KELP: SELL order for {order_size} units at {best_bid_kelp}", end=";")
+                            if DEBUG:
+                                print(f"--> Pair Trading: Shorting KELP: SELL order for {order_size} units at {best_bid_kelp}", end=";")
                     # For SQUID_INK: Long
-                    current_position_squid = state.position.get("SQUID_INK", 0)
+                    current_position_squid = get_position("SQUID_INK", 0)
                     available_buy_squid = max_position - current_position_squid
                     if best_ask_squid is not None and available_buy_squid > 0:
-                        order_size = min(available_buy_squid, -squid_depth.sell_orders[best_ask_squid])
+                        order_size = min(available_buy_squid, squid_ask_size)
                         if order_size > 0:
                             result["SQUID_INK"].append(Order("SQUID_INK", best_ask_squid, order_size))
-                            print(f"--> Pair Trading: Going Long SQUID_INK: BUY order for {order_size} units at {best_ask_squid}", end=";")
+                            if DEBUG:
+                                print(f"--> Pair Trading: Going Long SQUID_INK: BUY order for {order_size} units at {best_ask_squid}", end=";")
                 # If the Z-score is low: long KELP and short SQUID_INK
                 elif z_score < -threshold:
                     # For KELP: Long
-                    current_position_kelp = state.position.get("KELP", 0)
+                    current_position_kelp = get_position("KELP", 0)
                     available_buy_kelp = max_position - current_position_kelp
                     if best_ask_kelp is not None and available_buy_kelp > 0:
-                        order_size = min(available_buy_kelp, -kelp_depth.sell_orders[best_ask_kelp])
+                        order_size = min(available_buy_kelp, kelp_ask_size)
                         if order_size > 0:
                             result["KELP"].append(Order("KELP", best_ask_kelp, order_size))
-                            print(f"--> Pair Trading: Going Long KELP: BUY order for {order_size} units at {best_ask_kelp}", end=";")
+                            if DEBUG:
+                                print(f"--> Pair Trading: Going Long KELP: BUY order for {order_size} units at {best_ask_kelp}", end=";")
                     # For SQUID_INK: Short
-                    current_position_squid = state.position.get("SQUID_INK", 0)
+                    current_position_squid = get_position("SQUID_INK", 0)
                     available_sell_squid = max_position + current_position_squid
                     if best_bid_squid is not None and available_sell_squid > 0:
-                        order_size = min(available_sell_squid, squid_depth.buy_orders[best_bid_squid])
+                        order_size = min(available_sell_squid, squid_bid_size)
                         if order_size > 0:
                             result["SQUID_INK"].append(Order("SQUID_INK", best_bid_squid, -order_size))
-                            print(f"--> Pair Trading: Shorting SQUID_INK: SELL order for {order_size} units at {best_bid_squid}", end=";")
+                            if DEBUG:
+                                print(f"--> Pair Trading: Shorting SQUID_INK: SELL order for {order_size} units at {best_bid_squid}", end=";")
                 pair_trading_executed = True
 
         # ================================
@@ -115,50 +173,59 @@ class Trader:
             if product in ["KELP", "SQUID_INK"] and pair_trading_executed:
                 continue
 
+            # Products without a strategy handler keep their preallocated
+            # empty order list, so skip them before paying for the book scans
+            if product != "RAINFOREST_RESIN":
+                continue
+
             orders: List[Order] = []
-            current_position = state.position.get(product, 0)
+            current_position = get_position(product, 0)
 
-            best_ask = min(order_depth.sell_orders.keys(), default=None)
-            best_bid = max(order_depth.buy_orders.keys(), default=None)
+            best_bid, best_ask = _best_bid_ask(order_depth)
 
             if best_ask is None and best_bid is None:
                 continue
 
-            if best_ask is not None and best_bid is not None:
-                mid_price = (best_bid + best_ask) / 2
-            elif best_ask is not None:
-                mid_price = best_ask * 0.99
-            else:
-                mid_price = best_bid * 1.01
+            mid_price = mid_cache.get(product)
+            if mid_price is None:
+                mid_price = _mid_price(best_bid, best_ask)
 
             # RAINFOREST_RESIN Trading Logic (using a historical mean)
             if product == "RAINFOREST_RESIN":
                 historical_mean = trader_data.get(product, mid_price)
-                alpha = 0.1
-                updated_mean = alpha * mid_price + (1 - alpha) * historical_mean
+                updated_mean = _ema(mid_price, historical_mean, _A_RESIN, _MA_RESIN)
 
-                print(f"[Time {state.timestamp}] Product: {product}; Best Bid: {best_bid}; Best Ask: {best_ask}; Mid Price: {mid_price:.2f}; Historical Mean: {historical_mean:.2f}; Updated Mean: {updated_mean:.2f}; Current Position: {current_position}")
+                if DEBUG:
+                    print(f"[Time {state.timestamp}] Product: {product}; Best Bid: {best_bid}; Best Ask: {best_ask}; Mid Price: {mid_price:.2f}; Historical Mean: {historical_mean:.2f}; Updated Mean: {updated_mean:.2f}; Current Position: {current_position}")
 
                 available_buy = max_position - current_position   # units that can be bought
                 available_sell = max_position + current_position   # units that can be sold
 
+                # Top-of-book volumes, resolved once for both branches
+                ask_size = -order_depth.sell_orders[best_ask] if best_ask is not None else 0
+                bid_size = order_depth.buy_orders[best_bid] if best_bid is not None else 0
+
                 if best_ask is not None and best_ask < historical_mean and available_buy > 0:
-                    order_size = min(available_buy, -order_depth.sell_orders[best_ask])
+                    order_size = min(available_buy, ask_size)
                     if order_size > 0:
                         orders.append(Order(product, best_ask, order_size))
-                        print(f"--> RAINFOREST_RESIN: Placing BUY order for {order_size} units at {best_ask}", end=";")
-                
+                        if DEBUG:
+                            print(f"--> RAINFOREST_RESIN: Placing BUY order for {order_size} units at {best_ask}", end=";")
+
                 if best_bid is not None and best_bid > historical_mean and available_sell > 0:
-                    order_size = min(available_sell, order_depth.buy_orders[best_bid])
+                    order_size = min(available_sell, bid_size)
                     if order_size > 0:
                         orders.append(Order(product, best_bid, -order_size))
-                        print(f"--> RAINFOREST_RESIN: Placing SELL order for {order_size} units at {best_bid}", end=";")
+                        if DEBUG:
+                            print(f"--> RAINFOREST_RESIN: Placing SELL order for {order_size} units at {best_bid}", end=";")
                 
                 trader_data[product] = updated_mean
+                state_dirty = True
 
             # For products not explicitly handled above, no orders are placed.
             result[product] = orders
 
-        updated_trader_data = json.dumps(trader_data)
-        conversions = 1
-        return result, conversions, updated_trader_data
+        # Re-serialize only when something actually changed this tick
+        if state_dirty:
+            self._state_json = json.dumps(trader_data)
+        return result, 1, self._state_json
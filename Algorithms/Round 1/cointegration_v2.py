@@ -1,135 +1,229 @@
 import json
 from datamodel import OrderDepth, TradingState, Order
-from typing import List 
+from typing import List
+
+DEBUG = False  # gate per-tick prints: f-strings are only built when enabled
+
+MAX_POSITION = 50  # Position limit per product
+
+# EMA smoothing factors with precomputed complements; CPython does not
+# constant-fold (1 - alpha) when alpha is a local
+_A_RESIN = 0.1
+_MA_RESIN = 0.9
+_A_SHORT = 0.3
+_MA_SHORT = 0.7
+_A_LONG = 0.1
+_MA_LONG = 0.9
+_A_SPREAD = 0.05
+_MA_SPREAD = 0.95
+
+
+def _ema(x, prev, a, ma):
+    # Exponential moving average step, kept as a tiny module-level kernel so
+    # the hot loop works on locals only; ma is the precomputed (1 - a).
+    return a * x + ma * prev
+
+
+def _mid_price(best_bid, best_ask):
+    # Mid price from whichever book sides are present; the common two-sided
+    # path is a single add and multiply.
+    if best_bid is not None:
+        if best_ask is not None:
+            return (best_bid + best_ask) * 0.5
+        return best_bid * 1.01
+    if best_ask is not None:
+        return best_ask * 0.99
+    return None
+
+def _best_bid_ask(order_depth: OrderDepth):
+    # Single O(n) pass per side, iterating the dict directly instead of going
+    # through a keys() view; callers keep the results in locals so each book
+    # is scanned at most once per tick.
+    best_bid = max(order_depth.buy_orders) if order_depth.buy_orders else None
+    best_ask = min(order_depth.sell_orders) if order_depth.sell_orders else None
+    return best_bid, best_ask
+
 
 class Trader:
-    def run(self, state: TradingState):
-        result = {}
-        max_position = 50  # Position limit per product
+    def __init__(self):
+        # Resident copy of traderData so the hot path only pays for
+        # json.loads on a cold start (fresh process) and for json.dumps on
+        # ticks that actually mutate the state.
+        self._state = None
+        self._state_json = ""
+        # Per-product strategy dispatch: one hash lookup instead of a chain
+        # of string comparisons in the hot loop
+        self._handlers = {
+            "RAINFOREST_RESIN": self._handle_resin,
+            "KELP": self._handle_kelp,
+            "SQUID_INK": self._handle_squid_ink,
+        }
+
+    def _handle_resin(self, state, trader_data, product, order_depth,
+                      best_bid, best_ask, mid_price, current_position, prices,
+                      orders: List[Order]):
+        historical_mean = trader_data.get(product, mid_price)
+        updated_mean = _ema(mid_price, historical_mean, _A_RESIN, _MA_RESIN)
+
+        if DEBUG:
+            print(f"[Time {state.timestamp}] Product: {product}; Best Bid: {best_bid}; "
+                  f"Best Ask: {best_ask}; Mid Price: {mid_price:.2f}; Historical Mean: {historical_mean:.2f}; "
+                  f"Updated Mean: {updated_mean:.2f}; Current Position: {current_position}")
+
+        # Top-of-book volumes, resolved once for all branches
+        ask_size = -order_depth.sell_orders[best_ask] if best_ask is not None else 0
+        bid_size = order_depth.buy_orders[best_bid] if best_bid is not None else 0
+
+        available_buy = MAX_POSITION - current_position
+        available_sell = MAX_POSITION + current_position
+
+        if best_ask is not None and best_ask < historical_mean and available_buy > 0:
+            order_size = min(available_buy, ask_size)
+            if order_size > 0:
+                orders.append(Order(product, best_ask, order_size))
+                if DEBUG:
+                    print(f"--> RAINFOREST_RESIN: Placing BUY order for {order_size} units at {best_ask}", end=";")
+
+        if best_bid is not None and best_bid > historical_mean and available_sell > 0:
+            order_size = min(available_sell, bid_size)
+            if order_size > 0:
+                orders.append(Order(product, best_bid, -order_size))
+                if DEBUG:
+                    print(f"--> RAINFOREST_RESIN: Placing SELL order for {order_size} units at {best_bid}", end=";")
+
+        trader_data[product] = updated_mean
+        return True
+
+    def _handle_kelp(self, state, trader_data, product, order_depth,
+                     best_bid, best_ask, mid_price, current_position, prices,
+                     orders: List[Order]):
+        kelp_data = trader_data.get(product, {"short_ma": mid_price, "long_ma": mid_price})
+        short_ma = kelp_data.get("short_ma", mid_price)
+        long_ma = kelp_data.get("long_ma", mid_price)
+
+        updated_short_ma = _ema(mid_price, short_ma, _A_SHORT, _MA_SHORT)
+        updated_long_ma = _ema(mid_price, long_ma, _A_LONG, _MA_LONG)
+
+        if DEBUG:
+            print(f"[Time {state.timestamp}] Product: {product}; Best Bid: {best_bid}; "
+                  f"Best Ask: {best_ask}; Mid Price: {mid_price:.2f}; Short MA: {updated_short_ma:.2f}; "
+                  f"Long MA: {updated_long_ma:.2f}; Current Position: {current_position}")
+
+        # Top-of-book volumes, resolved once for all branches
+        ask_size = -order_depth.sell_orders[best_ask] if best_ask is not None else 0
+        bid_size = order_depth.buy_orders[best_bid] if best_bid is not None else 0
+
+        available_buy = MAX_POSITION - current_position
+        available_sell = MAX_POSITION + current_position
+
+        if updated_short_ma > updated_long_ma:
+            if best_ask is not None and best_ask < updated_short_ma and available_buy > 0:
+                order_size = min(available_buy, ask_size)
+                if order_size > 0:
+                    orders.append(Order(product, best_ask, order_size))
+                    if DEBUG:
+                        print(f"--> KELP: Bullish signal - Placing BUY order for {order_size} units at {best_ask}", end=";")
+        elif updated_short_ma < updated_long_ma:
+            if best_bid is not None and best_bid > updated_short_ma and available_sell > 0:
+                order_size = min(available_sell, bid_size)
+                if order_size > 0:
+                    orders.append(Order(product, best_bid, -order_size))
+                    if DEBUG:
+                        print(f"--> KELP: Bearish signal - Placing SELL order for {order_size} units at {best_bid}", end=";")
+
+        trader_data[product] = {"short_ma": updated_short_ma, "long_ma": updated_long_ma}
+        return True
+
+    def _handle_squid_ink(self, state, trader_data, product, order_depth,
+                          best_bid, best_ask, mid_price, current_position, prices,
+                          orders: List[Order]):
+        kelp_price = prices.get("KELP")
+        if kelp_price is None:
+            return False  # Need KELP to calculate spread
+
+        spread = mid_price - kelp_price
+        spread_data = trader_data.get(product, {"mean": spread, "std": 1})
+        mean_spread = spread_data.get("mean", spread)
+        std_spread = spread_data.get("std", 1)
+
+        # Update mean and std using exponential moving average (Welford could be better)
+        updated_mean = _ema(spread, mean_spread, _A_SPREAD, _MA_SPREAD)
+        updated_std = _ema(abs(spread - mean_spread), std_spread, _A_SPREAD, _MA_SPREAD)
+
+        z_score = (spread - updated_mean) / (updated_std + 1e-5)
+
+        if DEBUG:
+            print(f"[Time {state.timestamp}] Product: {product}; Spread: {spread:.2f}; Z-score: {z_score:.2f}; "
+                  f"Mean Spread: {updated_mean:.2f}; Std Dev: {updated_std:.2f}; Current Position: {current_position}")
+
+        # Top-of-book volumes, resolved once for all branches
+        ask_size = -order_depth.sell_orders[best_ask] if best_ask is not None else 0
+        bid_size = order_depth.buy_orders[best_bid] if best_bid is not None else 0
+
+        available_buy = MAX_POSITION - current_position
+        available_sell = MAX_POSITION + current_position
+
+        if z_score > 1 and available_sell > 0:
+            order_size = min(available_sell, bid_size)
+            if order_size > 0:
+                orders.append(Order(product, best_bid, -order_size))
+                if DEBUG:
+                    print(f"--> SQUID_INK: Spread high - Placing SELL order for {order_size} units at {best_bid}", end=";")
+        elif z_score < -1 and available_buy > 0:
+            order_size = min(available_buy, ask_size)
+            if order_size > 0:
+                orders.append(Order(product, best_ask, order_size))
+                if DEBUG:
+                    print(f"--> SQUID_INK: Spread low - Placing BUY order for {order_size} units at {best_ask}", end=";")
+
+        trader_data[product] = {"mean": updated_mean, "std": updated_std}
+        return True
 
-        try:
-            trader_data = json.loads(state.traderData) if state.traderData else {}
-        except Exception:
-            trader_data = {}
+    def run(self, state: TradingState):
+        # Preallocate one empty order list per product up front; no key
+        # checks or setdefault calls are needed later
+        result = {product: [] for product in state.order_depths}
+        # Bind the position lookup once; every later access is a plain local call
+        get_position = state.position.get
+
+        if self._state is None:
+            try:
+                self._state = json.loads(state.traderData) if state.traderData else {}
+            except Exception:
+                self._state = {}
+            self._state_json = state.traderData or ""
+        trader_data = self._state
+        state_dirty = False
 
         prices = {}  # Track mid-prices for cointegration logic
+        books = {}   # (order_depth, best_bid, best_ask) per handled product
+        handlers = self._handlers
 
+        # First pass: publish every handled product's mid-price so the
+        # cointegration handlers can read each other's mids regardless of
+        # dict iteration order (SQUID_INK no longer misses KELP when it
+        # happens to come first)
         for product, order_depth in state.order_depths.items():
-            orders: List[Order] = []
-            current_position = state.position.get(product, 0)
+            # Products without a strategy handler keep their preallocated
+            # empty order list
+            if product not in handlers:
+                continue
 
-            best_ask = min(order_depth.sell_orders.keys(), default=None)
-            best_bid = max(order_depth.buy_orders.keys(), default=None)
+            best_bid, best_ask = _best_bid_ask(order_depth)
 
             if best_ask is None and best_bid is None:
                 continue
 
-            if best_ask is not None and best_bid is not None:
-                mid_price = (best_bid + best_ask) / 2
-            elif best_ask is not None:
-                mid_price = best_ask * 0.99
-            else:
-                mid_price = best_bid * 1.01
-
-            prices[product] = mid_price  # Save for cointegration logic later
-
-            if product == "RAINFOREST_RESIN":
-                historical_mean = trader_data.get(product, mid_price)
-                alpha = 0.1
-                updated_mean = alpha * mid_price + (1 - alpha) * historical_mean
-
-                print(f"[Time {state.timestamp}] Product: {product}; Best Bid: {best_bid}; "
-                      f"Best Ask: {best_ask}; Mid Price: {mid_price:.2f}; Historical Mean: {historical_mean:.2f}; "
-                      f"Updated Mean: {updated_mean:.2f}; Current Position: {current_position}")
-
-                available_buy = max_position - current_position
-                available_sell = max_position + current_position
-
-                if best_ask is not None and best_ask < historical_mean and available_buy > 0:
-                    order_size = min(available_buy, -order_depth.sell_orders[best_ask])
-                    if order_size > 0:
-                        orders.append(Order(product, best_ask, order_size))
-                        print(f"--> RAINFOREST_RESIN: Placing BUY order for {order_size} units at {best_ask}", end=";")
-
-                if best_bid is not None and best_bid > historical_mean and available_sell > 0:
-                    order_size = min(available_sell, order_depth.buy_orders[best_bid])
-                    if order_size > 0:
-                        orders.append(Order(product, best_bid, -order_size))
-                        print(f"--> RAINFOREST_RESIN: Placing SELL order for {order_size} units at {best_bid}", end=";")
-
-                trader_data[product] = updated_mean
-
-            elif product == "KELP":
-                kelp_data = trader_data.get(product, {"short_ma": mid_price, "long_ma": mid_price})
-                short_ma = kelp_data.get("short_ma", mid_price)
-                long_ma = kelp_data.get("long_ma", mid_price)
-
-                alpha_short = 0.3
-                alpha_long = 0.1
-                updated_short_ma = alpha_short * mid_price + (1 - alpha_short) * short_ma
-                updated_long_ma = alpha_long * mid_price + (1 - alpha_long) * long_ma
-
-                print(f"[Time {state.timestamp}] Product: {product}; Best Bid: {best_bid}; "
-                      f"Best Ask: {best_ask}; Mid Price: {mid_price:.2f}; Short MA: {updated_short_ma:.2f}; "
-                      f"Long MA: {updated_long_ma:.2f}; Current Position: {current_position}")
-
-                available_buy = max_position - current_position
-                available_sell = max_position + current_position
-
-                if updated_short_ma > updated_long_ma:
-                    if best_ask is not None and best_ask < updated_short_ma and available_buy > 0:
-                        order_size = min(available_buy, -order_depth.sell_orders[best_ask])
-                        if order_size > 0:
-                            orders.append(Order(product, best_ask, order_size))
-                            print(f"--> KELP: Bullish signal - Placing BUY order for {order_size} units at {best_ask}", end=";")
-                elif updated_short_ma < updated_long_ma:
-                    if best_bid is not None and best_bid > updated_short_ma and available_sell > 0:
-                        order_size = min(available_sell, order_depth.buy_orders[best_bid])
-                        if order_size > 0:
-                            orders.append(Order(product, best_bid, -order_size))
-                            print(f"--> KELP: Bearish signal - Placing SELL order for {order_size} units at {best_bid}", end=";")
-
-                trader_data[product] = {"short_ma": updated_short_ma, "long_ma": updated_long_ma}
-
-            elif product == "SQUID_INK":
-                kelp_price = prices.get("KELP")
-                if kelp_price is None:
-                    result[product] = []
-                    continue  # Need KELP to calculate spread
-
-                spread = mid_price - kelp_price
-                spread_data = trader_data.get(product, {"mean": spread, "std": 1})
-                mean_spread = spread_data.get("mean", spread)
-                std_spread = spread_data.get("std", 1)
-                alpha_spread = 0.05
-
-                # Update mean and std using exponential moving average (Welford could be better)
-                updated_mean = alpha_spread * spread + (1 - alpha_spread) * mean_spread
-                updated_std = alpha_spread * abs(spread - mean_spread) + (1 - alpha_spread) * std_spread
-
-                z_score = (spread - updated_mean) / (updated_std + 1e-5)
-
-                print(f"[Time {state.timestamp}] Product: {product}; Spread: {spread:.2f}; Z-score: {z_score:.2f}; "
-                      f"Mean Spread: {updated_mean:.2f}; Std Dev: {updated_std:.2f}; Current Position: {current_position}")
-
-                available_buy = max_position - current_position
-                available_sell = max_position + current_position
-
-                if z_score > 1 and available_sell > 0:
-                    order_size = min(available_sell, order_depth.buy_orders.get(best_bid, 0))
-                    if order_size > 0:
-                        orders.append(Order(product, best_bid, -order_size))
-                        print(f"--> SQUID_INK: Spread high - Placing SELL order for {order_size} units at {best_bid}", end=";")
-                elif z_score < -1 and available_buy > 0:
-                    order_size = min(available_buy, -order_depth.sell_orders.get(best_ask, 0))
-                    if order_size > 0:
-                        orders.append(Order(product, best_ask, order_size))
-                        print(f"--> SQUID_INK: Spread low - Placing BUY order for {order_size} units at {best_ask}", end=";")
-
-                trader_data[product] = {"mean": updated_mean, "std": updated_std}
-
-            result[product] = orders
-
-        updated_trader_data = json.dumps(trader_data)
-        conversions = 1
-        return result, conversions, updated_trader_data
+            books[product] = (order_depth, best_bid, best_ask)
+            prices[product] = _mid_price(best_bid, best_ask)
+
+        # Second pass: dispatch the strategies against the complete mid set
+        for product, (order_depth, best_bid, best_ask) in books.items():
+            if handlers[product](state, trader_data, product, order_depth, best_bid, best_ask,
+                                 prices[product], get_position(product, 0), prices, result[product]):
+                state_dirty = True
+
+        # Re-serialize only when something actually changed this tick
+        if state_dirty:
+            self._state_json = json.dumps(trader_data)
+        return result, 1, self._state_json
@@ -1,83 +1,92 @@
 import subprocess
 import json
 import os
+import time
 from datetime import datetime
 from typing import Dict, List, Tuple
 import itertools
-from multiprocessing import Pool, cpu_count
+from multiprocessing import cpu_count
 import re
 
-def run_backtest(args: Tuple[str, int, Dict]) -> Tuple[Dict, float]:
-    """Run a single backtest with given parameters and return the parameters and profit."""
-    script_path, round_num, params = args
-    
-    # Create a temporary copy of the script with the parameters
-    with open(script_path, 'r') as f:
-        script_content = f.read()
-    
-    # Replace the parameters in the script while maintaining indentation
-    for param, value in params.items():
-        # Find the line with the parameter
-        lines = script_content.split('\n')
-        for i, line in enumerate(lines):
-            if line.strip().startswith(f"{param} = "):
-                # Preserve the original indentation
-                indent = len(line) - len(line.lstrip())
-                # Replace the line with the new value
-                lines[i] = ' ' * indent + f"{param} = {value}  # Grid search optimized"
-                break
-        script_content = '\n'.join(lines)
-    
-    # Write the modified script to a temporary file
-    temp_script = f"temp_grid_search_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{os.getpid()}.py"
+# Counter making temp-file names unique now that all backtests are launched
+# from the parent process
+_launch_counter = itertools.count()
+
+# All profit line variants folded into one precompiled alternation so each
+# output is scanned exactly once
+PROFIT_RE = re.compile(r"(?:Total profit|Final PnL|Profit):\s*([-+]?\d*\.?\d+)")
+
+def substitute_params(script_content: str, params: Dict) -> str:
+    """Rewrite assignment lines for the given parameters in a single regex pass.
+
+    Only the first assignment of each parameter is replaced, preserving its
+    indentation, matching the old line-by-line behaviour without the per-param
+    split/join of the whole source.
+    """
+    pattern = re.compile(
+        r"^(\s*)(" + "|".join(re.escape(p) for p in params) + r") = .*$",
+        re.MULTILINE
+    )
+    remaining = dict(params)
+
+    def repl(match):
+        name = match.group(2)
+        if name in remaining:
+            return f"{match.group(1)}{name} = {remaining.pop(name)}  # Grid search optimized"
+        return match.group(0)
+
+    return pattern.sub(repl, script_content)
+
+def launch_backtest(script_content: str, round_num: int, params: Dict):
+    """Start one backtest subprocess; returns (proc, stdout_path, temp_script, params).
+
+    Output goes to a file rather than a pipe so the child never blocks on a
+    full pipe buffer while the parent is busy elsewhere.
+    """
+    script_content = substitute_params(script_content, params)
+
+    tag = f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{os.getpid()}_{next(_launch_counter)}"
+    temp_script = f"temp_grid_search_{tag}.py"
     with open(temp_script, 'w') as f:
         f.write(script_content)
-    
+
+    cmd = f"python3 -m prosperity3bt {temp_script} {round_num}"
+    print(f"\nRunning command: {cmd}")
+
+    stdout_path = temp_script + ".out"
+    with open(stdout_path, 'w') as out:
+        proc = subprocess.Popen(cmd, shell=True, stdout=out, stderr=subprocess.STDOUT, text=True)
+    return proc, stdout_path, temp_script, params
+
+def collect_backtest(proc, stdout_path: str, temp_script: str, params: Dict) -> Tuple[Dict, float]:
+    """Parse the profit out of a finished backtest and clean up its temp files."""
+    profit = float('-inf')
     try:
-        # Run the backtest with the correct command format
-        cmd = f"python3 -m prosperity3bt {temp_script} {round_num}"
-        print(f"\nRunning command: {cmd}")
-        
-        result = subprocess.run(
-            cmd,
-            shell=True,
-            capture_output=True,
-            text=True
-        )
-        
-        # Debug: Print the full output
-        print(f"\nBacktest output for params {json.dumps(params)}:")
-        print("STDOUT:")
-        print(result.stdout)
-        print("\nSTDERR:")
-        print(result.stderr)
-        
-        # Try multiple patterns to find the profit
-        profit_patterns = [
-            r"Total profit:\s*([-+]?\d*\.?\d+)",
-            r"Final PnL:\s*([-+]?\d*\.?\d+)",
-            r"Profit:\s*([-+]?\d*\.?\d+)"
-        ]
-        
-        profit = float('-inf')
-        for pattern in profit_patterns:
-            match = re.search(pattern, result.stdout)
-            if match:
-                profit = float(match.group(1))
-                print(f"Extracted profit using pattern '{pattern}': {profit}")
-                break
-        
+        # Stream the output line by line and stop at the first profit line;
+        # long logs are never materialized as one string
+        with open(stdout_path, 'r') as f:
+            for line in f:
+                match = PROFIT_RE.search(line)
+                if match:
+                    profit = float(match.group(1))
+                    print(f"Extracted profit for params {json.dumps(params)}: {profit}")
+                    break
+
         if profit == float('-inf'):
-            print("No profit found in output!")
-            
+            # Only dump the output when something went wrong
+            print(f"\nNo profit found in output for params {json.dumps(params)}:")
+            with open(stdout_path, 'r') as f:
+                print(f.read())
+
     except Exception as e:
         print(f"Error running backtest: {str(e)}")
         profit = float('-inf')
     finally:
-        # Clean up the temporary file
-        if os.path.exists(temp_script):
-            os.remove(temp_script)
-    
+        # Clean up the temporary files
+        for path in (temp_script, stdout_path):
+            if os.path.exists(path):
+                os.remove(path)
+
     return params, profit
 
 def grid_search(script_path: str, round_num: int, param_grid: Dict) -> Tuple[Dict, float, List[Dict]]:
@@ -86,18 +95,38 @@ def grid_search(script_path: str, round_num: int, param_grid: Dict) -> Tuple[Dic
     param_names = list(param_grid.keys())
     param_values = list(param_grid.values())
     combinations = list(itertools.product(*param_values))
-    
-    # Prepare arguments for parallel processing
-    args = [(script_path, round_num, dict(zip(param_names, combo))) for combo in combinations]
-    
-    # Determine number of processes to use (leave one core free for system)
+
+    # Read the strategy source once; workers only substitute and write temps
+    with open(script_path, 'r') as f:
+        script_content = f.read()
+
+    # Parameter sets still waiting to be launched
+    pending = [dict(zip(param_names, combo)) for combo in combinations]
+
+    # Determine number of concurrent backtests (leave one core free for system)
     num_processes = max(1, cpu_count() - 1)
-    print(f"Running grid search with {num_processes} processes...")
-    
-    # Run backtests in parallel
-    with Pool(processes=num_processes) as pool:
-        results = pool.map(run_backtest, args)
-    
+    print(f"Running grid search with up to {num_processes} concurrent backtests...")
+
+    # The workers just shell out to prosperity3bt, so launch the subprocesses
+    # directly and collect whichever finishes first instead of tying up a
+    # Pool worker per run
+    running = []
+    results = []
+    while pending or running:
+        while pending and len(running) < num_processes:
+            running.append(launch_backtest(script_content, round_num, pending.pop()))
+
+        still_running = []
+        for proc, stdout_path, temp_script, params in running:
+            if proc.poll() is None:
+                still_running.append((proc, stdout_path, temp_script, params))
+            else:
+                results.append(collect_backtest(proc, stdout_path, temp_script, params))
+        running = still_running
+
+        if running:
+            time.sleep(0.1)
+
     # Process results
     best_params = None
     best_profit = float('-inf')
@@ -1,216 +1,314 @@
 import json
+import math
+from collections import deque
 from datamodel import TradingState, Order
 from typing import List
 
+DEBUG = False  # gate per-tick prints: f-strings are only built when enabled
+
+MAX_POSITION = 50  # Position limit per product
+
+# EMA smoothing factor for the RESIN historical mean, with its complement
+# precomputed; CPython does not constant-fold (1 - alpha) when alpha is a local
+_A_RESIN = 0.1
+_MA_RESIN = 0.9
+_A_VOL = 0.3
+_MA_VOL = 0.7
+
+
+def _kelp_mm_quote(short_ma, long_ma, trend, volatility, position, max_position, base_size):
+    # Scalar market-making quote kernel: fair price from the two MAs plus
+    # trend tilt, a position/volatility-aware spread, and clamped sizes.
+    # Bid floors and ask ceils so quotes stay on integer ticks.
+    trend_factor = trend / volatility if volatility > 0 else 0.0
+    fair_price = (0.7 * short_ma + 0.3 * long_ma) * (1 + 0.1 * trend_factor)
+    position_factor = position / max_position
+    adjusted_spread = 2 * volatility * (1 + 0.5 * abs(position_factor))
+    our_bid = math.floor(fair_price - adjusted_spread / 2)
+    our_ask = math.ceil(fair_price + adjusted_spread / 2)
+    buy_size = int(base_size * (1 - position_factor * 0.5) * (1 if trend_factor > 0 else 0.7))
+    sell_size = int(base_size * (1 + position_factor * 0.5) * (1 if trend_factor < 0 else 0.7))
+    buy_size = max(1, min(buy_size, max_position - position))
+    sell_size = max(1, min(sell_size, max_position + position))
+    return our_bid, our_ask, buy_size, sell_size
+
+
+def _mid_price(best_bid, best_ask):
+    # Mid price from whichever book sides are present; the common two-sided
+    # path is a single add and multiply.
+    if best_bid is not None:
+        if best_ask is not None:
+            return (best_bid + best_ask) * 0.5
+        return best_bid * 1.01
+    if best_ask is not None:
+        return best_ask * 0.99
+    return None
+
+def _best_bid_ask(order_depth):
+    # Single O(n) pass per side, iterating the dict directly instead of going
+    # through a keys() view; callers keep the results in locals so each book
+    # is scanned at most once per tick.
+    best_bid = max(order_depth.buy_orders) if order_depth.buy_orders else None
+    best_ask = min(order_depth.sell_orders) if order_depth.sell_orders else None
+    return best_bid, best_ask
+
+
 class Trader:
+    def __init__(self):
+        # Per-product strategy dispatch: one hash lookup instead of a chain
+        # of string comparisons in the hot loop
+        self._handlers = {
+            "RAINFOREST_RESIN": self._handle_resin,
+            "KELP": self._handle_kelp,
+        }
+        # Resident copy of traderData so a tick that changes nothing returns
+        # the previous serialized string without a fresh json.dumps
+        self._state = None
+        self._state_json = ""
+
+    # ================================
+    # RAINFOREST_RESIN Trading Logic
+    # ================================
+    def _handle_resin(self, state, trader_data, product, order_depth,
+                      best_bid, best_ask, mid_price, current_position,
+                      orders: List[Order]):
+        # Retrieve previous historical mean for RAINFOREST_RESIN (default to mid_price)
+        historical_mean = trader_data.get(product, mid_price)
+        # Update historical mean using exponential smoothing (alpha = 0.1)
+        updated_mean = _A_RESIN * mid_price + _MA_RESIN * historical_mean
+
+        if DEBUG:
+            print(f"[Time {state.timestamp}] Product: {product}; Best Bid: {best_bid}; "
+                  f"Best Ask: {best_ask}; Mid Price: {mid_price:.2f}; Historical Mean: {historical_mean:.2f}; "
+                  f"Updated Mean: {updated_mean:.2f}; Current Position: {current_position}")
+
+        # Top-of-book volumes, resolved once for all branches
+        ask_size = -order_depth.sell_orders[best_ask] if best_ask is not None else 0
+        bid_size = order_depth.buy_orders[best_bid] if best_bid is not None else 0
+
+        # Calculate available capacity based on current position
+        available_buy = MAX_POSITION - current_position   # units that can be bought
+        available_sell = MAX_POSITION + current_position  # units that can be sold (if short)
+
+        # Mean reversion strategy
+        # BUY: If best ask is below historical mean and we have capacity to buy
+        if best_ask is not None and best_ask < historical_mean and available_buy > 0:
+            order_size = min(available_buy, ask_size)
+            if order_size > 0:
+                orders.append(Order(product, best_ask, order_size))
+                if DEBUG:
+                    print(f"--> RAINFOREST_RESIN: Placing BUY order for {order_size} units at {best_ask}", end=";")
+
+        # SELL: If best bid is above historical mean and we have capacity to sell
+        if best_bid is not None and best_bid > historical_mean and available_sell > 0:
+            order_size = min(available_sell, bid_size)
+            if order_size > 0:
+                orders.append(Order(product, best_bid, -order_size))
+                if DEBUG:
+                    print(f"--> RAINFOREST_RESIN: Placing SELL order for {order_size} units at {best_bid}", end=";")
+
+        # Market making strategy
+        # Calculate spread based on volatility and position
+        position_factor = current_position / MAX_POSITION  # Ranges from -1 to 1
+        base_spread = 1.0  # Base spread in price units
+
+        # Adjust spread based on position (tighter when neutral, wider when position is extreme)
+        adjusted_spread = base_spread * (1 + 0.5 * abs(position_factor))
+
+        # Calculate our bid and ask prices as integer ticks (floor the bid,
+        # ceil the ask): the engine's order prices are ints, and int-int
+        # comparisons against the book levels below avoid float coercion
+        our_bid = math.floor(historical_mean - adjusted_spread/2)
+        our_ask = math.ceil(historical_mean + adjusted_spread/2)
+
+        # Adjust order sizes based on current position
+        # Smaller size for side that increases position imbalance
+        base_size = 10
+        buy_size = int(base_size * (1 - position_factor*0.5))  # Reduce buy size when long
+        sell_size = int(base_size * (1 + position_factor*0.5))  # Reduce sell size when short
+
+        # Ensure sizes are within limits
+        buy_size = min(buy_size, available_buy)
+        sell_size = min(sell_size, available_sell)
+
+        # Place market making orders if they improve upon the current best bid/ask
+        if our_bid > best_bid and buy_size > 0:
+            orders.append(Order(product, our_bid, buy_size))
+            if DEBUG:
+                print(f"--> RAINFOREST_RESIN MM: Placing BID for {buy_size} units at {our_bid}", end=";")
+
+        if our_ask < best_ask and sell_size > 0:
+            orders.append(Order(product, our_ask, -sell_size))
+            if DEBUG:
+                print(f"--> RAINFOREST_RESIN MM: Placing ASK for {sell_size} units at {our_ask}", end=";")
+
+        # Update the historical mean in trader_data
+        trader_data[product] = updated_mean
+
+    # ================================
+    # KELP Trading Logic (Multiple MAs)
+    # ================================
+    def _handle_kelp(self, state, trader_data, product, order_depth,
+                     best_bid, best_ask, mid_price, current_position,
+                     orders: List[Order]):
+        # Retrieve previous data for KELP (or initialize windows); deques
+        # evict from the head in O(1) instead of list.pop(0)'s O(n) shift
+        kelp_data = trader_data.get(product, {"short_prices": [], "long_prices": [], "volatility": 1.0})
+        short_prices = deque(kelp_data.get("short_prices", []), maxlen=10)
+        long_prices = deque(kelp_data.get("long_prices", []), maxlen=50)
+        last_volatility = kelp_data.get("volatility", 1.0)
+        # Incremental window accumulators; rebuilt once if restored
+        # from an older traderData blob that predates them
+        if "w5_sumsq" in kelp_data:
+            short_sum = kelp_data["short_sum"]
+            long_sum = kelp_data["long_sum"]
+            w5_sum = kelp_data["w5_sum"]
+            w5_sumsq = kelp_data["w5_sumsq"]
+        else:
+            short_sum = sum(short_prices)
+            long_sum = sum(long_prices)
+            w5 = list(short_prices)[-5:]
+            w5_sum = sum(w5)
+            w5_sumsq = sum(p * p for p in w5)
+
+        # The deques evict automatically on append; grab the heads that will
+        # fall out so the running sums stay in step
+        short_evict = short_prices[0] if len(short_prices) == 10 else 0.0
+        long_evict = long_prices[0] if len(long_prices) == 50 else 0.0
+
+        # Slide the 5-price variance window before appending: the
+        # element 5 back drops out once mid_price comes in
+        if len(short_prices) >= 5:
+            evicted = short_prices[-5]
+            w5_sum += mid_price - evicted
+            w5_sumsq += mid_price * mid_price - evicted * evicted
+        else:
+            w5_sum += mid_price
+            w5_sumsq += mid_price * mid_price
+
+        # Append the new mid_price to each window
+        short_prices.append(mid_price)
+        long_prices.append(mid_price)
+        short_sum += mid_price - short_evict
+        long_sum += mid_price - long_evict
+
+        # Compute the short and long MAs from the running sums
+        short_ma = short_sum / len(short_prices)
+        long_ma = long_sum / len(long_prices)
+
+        # Calculate recent volatility (standard deviation of short_prices)
+        if len(short_prices) > 5:
+            mean = w5_sum / 5
+            variance = max(w5_sumsq / 5 - mean * mean, 0.0)
+            # Smooth volatility estimate
+            volatility = _A_VOL * (variance ** 0.5) + _MA_VOL * last_volatility
+        else:
+            volatility = last_volatility
+
+        if DEBUG:
+            print(f"[Time {state.timestamp}] Product: {product}; Best Bid: {best_bid}; "
+                  f"Best Ask: {best_ask}; Mid Price: {mid_price:.2f}; "
+                  f"Short MA(30): {short_ma:.2f}; Long MA(50): {long_ma:.2f}; "
+                  f"Volatility: {volatility:.2f}; Current Position: {current_position}")
+
+        # Calculate available capacity based on current position
+        # Top-of-book volumes, resolved once for all branches
+        ask_size = -order_depth.sell_orders[best_ask] if best_ask is not None else 0
+        bid_size = order_depth.buy_orders[best_bid] if best_bid is not None else 0
+
+        available_buy = MAX_POSITION - current_position
+        available_sell = MAX_POSITION + current_position
+
+        # Moving average crossover strategy
+        # Signal generation using moving average crossovers:
+        # Bullish signal if short MA is above long MA; bearish if below.
+        if short_ma < long_ma:
+            # Bullish: if best ask is below the short MA, consider buying
+            if best_ask is not None and best_ask < short_ma and available_buy > 0:
+                order_size = min(available_buy, ask_size)
+                if order_size > 0:
+                    orders.append(Order(product, best_ask, order_size))
+                    if DEBUG:
+                        print(f"--> KELP: Bullish signal - Placing BUY order for {order_size} units at {best_ask}", end=";")
+        elif short_ma > long_ma:
+            # Bearish: if best bid is above the short MA, consider selling
+            if best_bid is not None and best_bid > short_ma and available_sell > 0:
+                order_size = min(available_sell, bid_size)
+                if order_size > 0:
+                    orders.append(Order(product, best_bid, -order_size))
+                    if DEBUG:
+                        print(f"--> KELP: Bearish signal - Placing SELL order for {order_size} units at {best_bid}", end=";")
+
+        # Market making strategy for KELP; the quote arithmetic lives in the
+        # module-level kernel so this handler makes one call over locals
+        trend = short_prices[-1] - short_prices[-2] if len(short_prices) > 2 else 0.0
+        our_bid, our_ask, buy_size, sell_size = _kelp_mm_quote(
+            short_ma, long_ma, trend, volatility, current_position, MAX_POSITION, 8)
+
+        # Place market making orders if they improve upon the current best bid/ask
+        if best_bid is None or our_bid > best_bid and buy_size > 0:
+            orders.append(Order(product, our_bid, buy_size))
+            if DEBUG:
+                print(f"--> KELP MM: Placing BID for {buy_size} units at {our_bid}", end=";")
+
+        if best_ask is None or our_ask < best_ask and sell_size > 0:
+            orders.append(Order(product, our_ask, -sell_size))
+            if DEBUG:
+                print(f"--> KELP MM: Placing ASK for {sell_size} units at {our_ask}", end=";")
+
+        # Update data in trader_data (deques back to lists for JSON)
+        kelp_data["short_prices"] = list(short_prices)
+        kelp_data["long_prices"] = list(long_prices)
+        kelp_data["volatility"] = volatility
+        kelp_data["short_sum"] = short_sum
+        kelp_data["long_sum"] = long_sum
+        kelp_data["w5_sum"] = w5_sum
+        kelp_data["w5_sumsq"] = w5_sumsq
+        trader_data[product] = kelp_data
+
     def run(self, state: TradingState):
-        result = {}
-        max_position = 50  # Position limit per product
+        # Preallocate one empty order list per product up front; no key
+        # checks or setdefault calls are needed later
+        result = {product: [] for product in state.order_depths}
+        # Bind the position lookup once; every later access is a plain local call
+        get_position = state.position.get
+
+        # Load previous state from traderData only on a cold start
+        if self._state is None:
+            try:
+                self._state = json.loads(state.traderData) if state.traderData else {}
+            except Exception:
+                self._state = {}
+            self._state_json = state.traderData or ""
+        trader_data = self._state
+        state_dirty = False
 
-        # Load previous state from traderData (if available)
-        try:
-            trader_data = json.loads(state.traderData) if state.traderData else {}
-        except Exception:
-            trader_data = {}
+        handlers = self._handlers
 
         # Process each product separately
         for product, order_depth in state.order_depths.items():
-            orders: List[Order] = []
-            current_position = state.position.get(product, 0)
+            # Products without a strategy handler keep their preallocated
+            # empty order list
+            handler = handlers.get(product)
+            if handler is None:
+                continue
 
             # Determine best ask (lowest sell) and best bid (highest buy)
-            best_ask = min(order_depth.sell_orders.keys(), default=None)
-            best_bid = max(order_depth.buy_orders.keys(), default=None)
+            best_bid, best_ask = _best_bid_ask(order_depth)
 
             # Skip if there are no valid bids or asks
             if best_ask is None and best_bid is None:
                 continue
 
             # Calculate mid-price from available orders
-            if best_ask is not None and best_bid is not None:
-                mid_price = (best_bid + best_ask) / 2
-            elif best_ask is not None:
-                mid_price = best_ask * 0.99
-            else:  # best_bid is not None
-                mid_price = best_bid * 1.01
-
-            # ================================
-            # RAINFOREST_RESIN Trading Logic
-            # ================================
-            if product == "RAINFOREST_RESIN":
-                # Retrieve previous historical mean for RAINFOREST_RESIN (default to mid_price)
-                historical_mean = trader_data.get(product, mid_price)
-                # Update historical mean using exponential smoothing (alpha = 0.1)
-                alpha = 0.1
-                updated_mean = alpha * mid_price + (1 - alpha) * historical_mean
-
-                print(f"[Time {state.timestamp}] Product: {product}; Best Bid: {best_bid}; "
-                      f"Best Ask: {best_ask}; Mid Price: {mid_price:.2f}; Historical Mean: {historical_mean:.2f}; "
-                      f"Updated Mean: {updated_mean:.2f}; Current Position: {current_position}")
-
-                # Calculate available capacity based on current position
-                available_buy = max_position - current_position   # units that can be bought
-                available_sell = max_position + current_position  # units that can be sold (if short)
-
-                # Mean reversion strategy
-                # BUY: If best ask is below historical mean and we have capacity to buy
-                if best_ask is not None and best_ask < historical_mean and available_buy > 0:
-                    order_size = min(available_buy, -order_depth.sell_orders[best_ask])
-                    if order_size > 0:
-                        orders.append(Order(product, best_ask, order_size))
-                        print(f"--> RAINFOREST_RESIN: Placing BUY order for {order_size} units at {best_ask}", end=";")
-                
-                # SELL: If best bid is above historical mean and we have capacity to sell
-                if best_bid is not None and best_bid > historical_mean and available_sell > 0:
-                    order_size = min(available_sell, order_depth.buy_orders[best_bid])
-                    if order_size > 0:
-                        orders.append(Order(product, best_bid, -order_size))
-                        print(f"--> RAINFOREST_RESIN: Placing SELL order for {order_size} units at {best_bid}", end=";")
-                
-                # Market making strategy
-                # Calculate spread based on volatility and position
-                position_factor = current_position / max_position  # Ranges from -1 to 1
-                base_spread = 1.0  # Base spread in price units
-                
-                # Adjust spread based on position (tighter when neutral, wider when position is extreme)
-                adjusted_spread = base_spread * (1 + 0.5 * abs(position_factor))
-                
-                # Calculate our bid and ask prices
-                our_bid = historical_mean - adjusted_spread/2
-                our_ask = historical_mean + adjusted_spread/2
-                
-                # Adjust order sizes based on current position
-                # Smaller size for side that increases position imbalance
-                base_size = 10
-                buy_size = int(base_size * (1 - position_factor*0.5))  # Reduce buy size when long
-                sell_size = int(base_size * (1 + position_factor*0.5))  # Reduce sell size when short
-                
-                # Ensure sizes are within limits
-                buy_size = min(buy_size, available_buy)
-                sell_size = min(sell_size, available_sell)
-                
-                # Place market making orders if they improve upon the current best bid/ask
-                if our_bid > best_bid and buy_size > 0:
-                    orders.append(Order(product, our_bid, buy_size))
-                    print(f"--> RAINFOREST_RESIN MM: Placing BID for {buy_size} units at {our_bid}", end=";")
-                
-                if our_ask < best_ask and sell_size > 0:
-                    orders.append(Order(product, our_ask, -sell_size))
-                    print(f"--> RAINFOREST_RESIN MM: Placing ASK for {sell_size} units at {our_ask}", end=";")
-                
-                # Update the historical mean in trader_data
-                trader_data[product] = updated_mean
-
-            # ================================
-            # KELP Trading Logic (Multiple MAs)
-            # ================================
-            elif product == "KELP":
-                # Retrieve previous data for KELP (or initialize lists)
-                kelp_data = trader_data.get(product, {"short_prices": [], "long_prices": [], "volatility": 1.0})
-                short_prices = kelp_data.get("short_prices", [])
-                long_prices = kelp_data.get("long_prices", [])
-                last_volatility = kelp_data.get("volatility", 1.0)
-
-                # Append the new mid_price to each list
-                short_prices.append(mid_price)
-                long_prices.append(mid_price)
-
-                # Keep the short_prices list to a length of 30
-                if len(short_prices) > 10:
-                    short_prices.pop(0)
-                # Keep the long_prices list to a length of 50
-                if len(long_prices) > 50:
-                    long_prices.pop(0)
-
-                # Compute the short and long MAs
-                short_ma = sum(short_prices) / len(short_prices)
-                long_ma = sum(long_prices) / len(long_prices)
-                
-                # Calculate recent volatility (standard deviation of short_prices)
-                if len(short_prices) > 5:
-                    mean = sum(short_prices[-5:]) / 5
-                    variance = sum((p - mean) ** 2 for p in short_prices[-5:]) / 5
-                    volatility = (variance ** 0.5)
-                    # Smooth volatility estimate
-                    volatility = 0.3 * volatility + 0.7 * last_volatility
-                else:
-                    volatility = last_volatility
-
-                print(f"[Time {state.timestamp}] Product: {product}; Best Bid: {best_bid}; "
-                      f"Best Ask: {best_ask}; Mid Price: {mid_price:.2f}; "
-                      f"Short MA(30): {short_ma:.2f}; Long MA(50): {long_ma:.2f}; "
-                      f"Volatility: {volatility:.2f}; Current Position: {current_position}")
-
-                # Calculate available capacity based on current position
-                available_buy = max_position - current_position
-                available_sell = max_position + current_position
-
-                # Moving average crossover strategy
-                # Signal generation using moving average crossovers:
-                # Bullish signal if short MA is above long MA; bearish if below.
-                if short_ma < long_ma:
-                    # Bullish: if best ask is below the short MA, consider buying
-                    if best_ask is not None and best_ask < short_ma and available_buy > 0:
-                        order_size = min(available_buy, -order_depth.sell_orders[best_ask])
-                        if order_size > 0:
-                            orders.append(Order(product, best_ask, order_size))
-                            print(f"--> KELP: Bullish signal - Placing BUY order for {order_size} units at {best_ask}", end=";")
-                elif short_ma > long_ma:
-                    # Bearish: if best bid is above the short MA, consider selling
-                    if best_bid is not None and best_bid > short_ma and available_sell > 0:
-                        order_size = min(available_sell, order_depth.buy_orders[best_bid])
-                        if order_size > 0:
-                            orders.append(Order(product, best_bid, -order_size))
-                            print(f"--> KELP: Bearish signal - Placing SELL order for {order_size} units at {best_bid}", end=";")
-
-                # Market making strategy for KELP
-                # Calculate fair price (weighted average of short and long MAs)
-                trend_factor = 0.0
-                if len(short_prices) > 2:
-                    # Calculate short-term trend
-                    trend = short_prices[-1] - short_prices[-2]
-                    trend_factor = trend / volatility if volatility > 0 else 0
-                
-                # Fair price considers both MAs and recent trend
-                fair_price = (0.7 * short_ma + 0.3 * long_ma) * (1 + 0.1 * trend_factor) 
-                
-                # Position-aware spread
-                position_factor = current_position / max_position
-                base_spread = 2 * volatility  # Dynamic spread based on volatility
-                adjusted_spread = base_spread * (1 + 0.5 * abs(position_factor))
-                
-                # Calculate our bid and ask prices
-                our_bid = fair_price - adjusted_spread/2
-                our_ask = fair_price + adjusted_spread/2
-                
-                # Adjust order sizes based on current position and trend
-                base_size = 8
-                trend_adjustment = 1 + (0.3 * trend_factor)
-                buy_size = int(base_size * (1 - position_factor*0.5) * (1 if trend_factor > 0 else 0.7))
-                sell_size = int(base_size * (1 + position_factor*0.5) * (1 if trend_factor < 0 else 0.7))
-                
-                buy_size = max(1, min(buy_size, available_buy))
-                sell_size = max(1, min(sell_size, available_sell))
-                
-                # Place market making orders if they improve upon the current best bid/ask
-                if best_bid is None or our_bid > best_bid and buy_size > 0:
-                    orders.append(Order(product, our_bid, buy_size))
-                    print(f"--> KELP MM: Placing BID for {buy_size} units at {our_bid}", end=";")
-                
-                if best_ask is None or our_ask < best_ask and sell_size > 0:
-                    orders.append(Order(product, our_ask, -sell_size))
-                    print(f"--> KELP MM: Placing ASK for {sell_size} units at {our_ask}", end=";")
-
-                # Update data in trader_data
-                kelp_data["short_prices"] = short_prices
-                kelp_data["long_prices"] = long_prices
-                kelp_data["volatility"] = volatility
-                trader_data[product] = kelp_data
-
-            # If product is neither RAINFOREST_RESIN nor KELP, leave orders empty.
-            result[product] = orders
-
-        # Save trader_data as JSON string for the next iteration
-        updated_trader_data = json.dumps(trader_data)
-        conversions = 1
-        return result, conversions, updated_trader_data
\ No newline at end of file
+            mid_price = _mid_price(best_bid, best_ask)
+
+            handler(state, trader_data, product, order_depth, best_bid, best_ask,
+                    mid_price, get_position(product, 0), result[product])
+            state_dirty = True
+
+        # Re-serialize only when a handler actually ran this tick; otherwise
+        # hand back the previous string untouched
+        if state_dirty:
+            self._state_json = json.dumps(trader_data)
+        return result, 1, self._state_json
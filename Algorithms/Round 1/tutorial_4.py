@@ -27,8 +27,8 @@ class Trader:
             current_position = state.position.get(product, 0)
 
             # Determine best ask (lowest sell) and best bid (highest buy)
-            best_ask = min(order_depth.sell_orders.keys(), default=None)
-            best_bid = max(order_depth.buy_orders.keys(), default=None)
+            best_ask = min(order_depth.sell_orders, default=None)
+            best_bid = max(order_depth.buy_orders, default=None)
 
             # Skip if there are no valid bids or asks
             if best_ask is None and best_bid is None:
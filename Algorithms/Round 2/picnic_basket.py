@@ -3,8 +3,14 @@ from datamodel import TradingState, Order
 from typing import List
 
 class Trader:
+    def __init__(self):
+        # Resident copy of traderData; the instance persists across ticks,
+        # so json.loads only runs on a cold start (fresh process)
+        self._state = None
+
     def run(self, state: TradingState):
-        result = {}
+        # Preallocate one empty order list per product up front
+        result = {product: [] for product in state.order_depths}
         # POSITION LIMITS:
         POSITION_LIMITS = {
             "CROISSANTS": 250,
@@ -13,20 +19,22 @@ class Trader:
             "PICNIC_BASKET1": 60,
             "PICNIC_BASKET2": 100,
         }
-        # Load previous state from traderData (if available)
-        try:
-            trader_data = json.loads(state.traderData) if state.traderData else {}
-        except Exception:
-            trader_data = {}
+        # Load previous state from traderData only on a cold start
+        if self._state is None:
+            try:
+                self._state = json.loads(state.traderData) if state.traderData else {}
+            except Exception:
+                self._state = {}
+        trader_data = self._state
 
         # Process each product separately
         for product, order_depth in state.order_depths.items():
-            orders: List[Order] = []
+            orders = result[product]
             current_position = state.position.get(product, 0)
 
             # Determine best ask (lowest sell) and best bid (highest buy)
-            best_ask = min(order_depth.sell_orders.keys(), default=None)
-            best_bid = max(order_depth.buy_orders.keys(), default=None)
+            best_ask = min(order_depth.sell_orders, default=None)
+            best_bid = max(order_depth.buy_orders, default=None)
 
             # Skip if there are no valid bids or asks
             if best_ask is None and best_bid is None:
@@ -53,9 +61,6 @@ class Trader:
                 # order_size = min(available_buy, -order_depth.sell_orders[best_ask])
                 # if order_size > 0:
                 #     orders.append(Order(product, best_ask, order_size))
-        
-        
-        result[product] = orders
 
         # Save trader_data as JSON string for the next iteration
         updated_trader_data = json.dumps(trader_data)
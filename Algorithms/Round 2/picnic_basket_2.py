@@ -2,9 +2,31 @@ import json
 from datamodel import TradingState, Order
 from typing import List
 
+# Baskets must see every component mid before pricing; a fixed pass order
+# decouples the arbitrage from dict iteration order
+PRODUCT_ORDER = ("CROISSANTS", "JAMS", "DJEMBES", "PICNIC_BASKET1", "PICNIC_BASKET2")
+
+
+def _mid_price(best_bid, best_ask):
+    # Mid price from whichever book sides are present
+    if best_bid is not None:
+        if best_ask is not None:
+            return (best_bid + best_ask) * 0.5
+        return best_bid * 1.01
+    if best_ask is not None:
+        return best_ask * 0.99
+    return None
+
+
 class Trader:
+    def __init__(self):
+        # Resident copy of traderData; the instance persists across ticks,
+        # so json.loads only runs on a cold start (fresh process)
+        self._state = None
+
     def run(self, state: TradingState):
-        result = {}
+        # Preallocate one empty order list per product up front
+        result = {product: [] for product in state.order_depths}
         # POSITION LIMITS:
         POSITION_LIMITS = {
             "CROISSANTS": 250,
@@ -13,89 +35,106 @@ class Trader:
             "PICNIC_BASKET1": 60,
             "PICNIC_BASKET2": 100,
         }
-        # Load previous state from traderData (if available)
-        try:
-            trader_data = json.loads(state.traderData) if state.traderData else {}
-        except Exception:
-            trader_data = {}
+        # Unpack the limits and bind hot builtins once; inside the loop
+        # these are LOAD_FAST instead of dict/global lookups
+        lim_cr = POSITION_LIMITS["CROISSANTS"]
+        lim_j = POSITION_LIMITS["JAMS"]
+        lim_d = POSITION_LIMITS["DJEMBES"]
+        lim_b1 = POSITION_LIMITS["PICNIC_BASKET1"]
+        lim_b2 = POSITION_LIMITS["PICNIC_BASKET2"]
+        _Order = Order
+        _min = min
+        _max = max
+
+        # Positions resolved once per tick; the arb sizing below reads
+        # these locals instead of hitting state.position repeatedly
+        pos = state.position
+        pos_get = pos.get
+        pos_cr = pos_get("CROISSANTS", 0)
+        pos_j = pos_get("JAMS", 0)
+        pos_d = pos_get("DJEMBES", 0)
+        pos_b1 = pos_get("PICNIC_BASKET1", 0)
+        pos_b2 = pos_get("PICNIC_BASKET2", 0)
+        # Load previous state from traderData only on a cold start
+        if self._state is None:
+            try:
+                self._state = json.loads(state.traderData) if state.traderData else {}
+            except Exception:
+                self._state = {}
+        trader_data = self._state
         
-        # Store mid-prices for later fair value calculations
+        # First pass: best-of-book and mid-price for every product with a
+        # live book, so basket fair values see all component mids
         mid_prices = {}
-
-        # Process each product separately
+        books = {}
         for product, order_depth in state.order_depths.items():
-            orders: List[Order] = []
-            current_position = state.position.get(product, 0)
-
-            # Determine best ask (lowest sell) and best bid (highest buy)
-            best_ask = min(order_depth.sell_orders.keys(), default=None)
-            best_bid = max(order_depth.buy_orders.keys(), default=None)
+            best_ask_item = _min(order_depth.sell_orders.items(), default=None)
+            best_bid_item = _max(order_depth.buy_orders.items(), default=None)
+            best_ask, ask_vol = best_ask_item if best_ask_item else (None, 0)
+            best_bid, bid_vol = best_bid_item if best_bid_item else (None, 0)
 
             # Skip if there are no valid bids or asks
             if best_ask is None and best_bid is None:
                 continue
 
-            # Calculate mid-price from available orders
-            if best_ask is not None and best_bid is not None:
-                mid_price = (best_bid + best_ask) / 2
-            elif best_ask is not None:
-                mid_price = best_ask * 0.99
-            else:  # best_bid is not None
-                mid_price = best_bid * 1.01
-            
-            mid_prices[product] = mid_price
+            books[product] = (best_bid, best_ask)
+            mid_prices[product] = _mid_price(best_bid, best_ask)
+
+        # Second pass in fixed order: components first, then baskets
+        for product in PRODUCT_ORDER:
+            book = books.get(product)
+            if book is None:
+                continue
+            best_bid, best_ask = book
+            mid_price = mid_prices[product]
+            orders = result[product]
 
-            # Store orders (none yet for components)
-            if product in {"DJEMBES", "CROISSANTS", "JAMS"}:
-                result[product] = []
-            elif product == "PICNIC_BASKET1":
+            # Components keep their preallocated empty lists until a basket
+            # branch fills them in
+            if product == "PICNIC_BASKET1":
                 # Evaluate fair value: 6 CROISSANTS + 3 JAMS + 1 DJEMBES
-                if all(p in mid_prices for p in ["CROISSANTS", "JAMS", "DJEMBES"]):
-                    fair_value = (
-                        6 * mid_prices["CROISSANTS"] +
-                        3 * mid_prices["JAMS"] +
-                        1 * mid_prices["DJEMBES"]
-                    )
+                # Component mids read once; reused for fair value and
+                # the component legs below
+                mp_cr = mid_prices.get("CROISSANTS")
+                mp_j = mid_prices.get("JAMS")
+                mp_d = mid_prices.get("DJEMBES")
+                if mp_cr is not None and mp_j is not None and mp_d is not None:
+                    fair_value = 6 * mp_cr + 3 * mp_j + mp_d
                     profit = mid_price - fair_value
 
                     if profit > 1:  # arbitrage threshold
                         # Sell 1 basket, buy 6/3/1 of components
-                        max_trades = min(
-                            POSITION_LIMITS["PICNIC_BASKET1"] - state.position.get("PICNIC_BASKET1", 0),
-                            (POSITION_LIMITS["CROISSANTS"] - state.position.get("CROISSANTS", 0)) // 6,
-                            (POSITION_LIMITS["JAMS"] - state.position.get("JAMS", 0)) // 3,
-                            (POSITION_LIMITS["DJEMBES"] - state.position.get("DJEMBES", 0)) // 1,
+                        max_trades = _min(
+                            lim_b1 - pos_b1,
+                            (lim_cr - pos_cr) // 6,
+                            (lim_j - pos_j) // 3,
+                            (lim_d - pos_d) // 1,
                         )
                         if best_bid:
-                            orders.append(Order(product, best_bid, -max_trades))
-                        result["CROISSANTS"] = [Order("CROISSANTS", mid_prices["CROISSANTS"], 6 * max_trades)]
-                        result["JAMS"] = [Order("JAMS", mid_prices["JAMS"], 3 * max_trades)]
-                        result["DJEMBES"] = [Order("DJEMBES", mid_prices["DJEMBES"], 1 * max_trades)]
+                            orders.append(_Order(product, best_bid, -max_trades))
+                        result["CROISSANTS"] = [_Order("CROISSANTS", mp_cr, 6 * max_trades)]
+                        result["JAMS"] = [_Order("JAMS", mp_j, 3 * max_trades)]
+                        result["DJEMBES"] = [_Order("DJEMBES", mp_d, 1 * max_trades)]
 
             elif product == "PICNIC_BASKET2":
                 # Evaluate fair value: 4 CROISSANTS + 2 JAMS
-                if all(p in mid_prices for p in ["CROISSANTS", "JAMS"]):
-                    fair_value = (
-                        4 * mid_prices["CROISSANTS"] +
-                        2 * mid_prices["JAMS"]
-                    )
+                mp_cr = mid_prices.get("CROISSANTS")
+                mp_j = mid_prices.get("JAMS")
+                if mp_cr is not None and mp_j is not None:
+                    fair_value = 4 * mp_cr + 2 * mp_j
                     profit = fair_value - mid_price
 
                     if profit > 1:  # arbitrage threshold
                         # Buy 1 basket, sell 4/2 of components
-                        max_trades = min(
-                            POSITION_LIMITS["PICNIC_BASKET2"] - state.position.get("PICNIC_BASKET2", 0),
-                            (POSITION_LIMITS["CROISSANTS"] + state.position.get("CROISSANTS", 0)) // 4,
-                            (POSITION_LIMITS["JAMS"] + state.position.get("JAMS", 0)) // 2,
+                        max_trades = _min(
+                            lim_b2 - pos_b2,
+                            (lim_cr + pos_cr) // 4,
+                            (lim_j + pos_j) // 2,
                         )
                         if best_ask:
-                            orders.append(Order(product, best_ask, max_trades))
-                        result["CROISSANTS"] = result.get("CROISSANTS", []) + [Order("CROISSANTS", mid_prices["CROISSANTS"], -4 * max_trades)]
-                        result["JAMS"] = result.get("JAMS", []) + [Order("JAMS", mid_prices["JAMS"], -2 * max_trades)]
-
-        
-        
-        result[product] = orders
+                            orders.append(_Order(product, best_ask, max_trades))
+                        result["CROISSANTS"] = result.get("CROISSANTS", []) + [_Order("CROISSANTS", mp_cr, -4 * max_trades)]
+                        result["JAMS"] = result.get("JAMS", []) + [_Order("JAMS", mp_j, -2 * max_trades)]
 
         # Save trader_data as JSON string for the next iteration
         updated_trader_data = json.dumps(trader_data)
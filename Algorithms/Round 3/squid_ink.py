@@ -1,59 +1,92 @@
 import json
-import numpy as np
+from math import erf, sqrt
 from datamodel import TradingState, Order
 from typing import List, Dict
 
-def erf(x: float) -> float:
-    """Numerical approximation to the error function."""
-    # Constants
-    a1 = 0.254829592
-    a2 = -0.284496736
-    a3 = 1.421413741
-    a4 = -1.453152027
-    a5 = 1.061405429
-    p = 0.3275911
-
-    sign = 1 if x >= 0 else -1
-    x = abs(x)
-
-    t = 1.0 / (1.0 + p * x)
-    y = 1.0 - (((((a5 * t + a4) * t + a3) * t + a2) * t + a1) * t * np.exp(-x * x))
-
-    return sign * y
-
-
-def is_in_stable_pocket(prices: List[float], window: int, std_threshold: float) -> bool:
-    if len(prices) < window:
-        return False
-    recent_prices = prices[-window:]
-    rolling_std = np.std(recent_prices)
-    rolling_mean = np.mean(recent_prices)
-    current_price = prices[-1]
+_SQRT2 = sqrt(2.0)
+
+
+def _ring_new(size: int, values=None) -> Dict:
+    # Fixed-size ring buffer as a plain dict so it drops straight into the
+    # traderData JSON; head is the slot the next push overwrites.
+    ring = {"buf": [0.0] * size, "head": 0, "count": 0}
+    if values:
+        for v in values[-size:]:
+            _ring_push(ring, v)
+    return ring
+
+
+def _ring_push(ring: Dict, value: float) -> None:
+    # O(1) append-with-eviction; no element shifting, no reallocation.
+    buf = ring["buf"]
+    head = ring["head"]
+    buf[head] = value
+    ring["head"] = (head + 1) % len(buf)
+    if ring["count"] < len(buf):
+        ring["count"] += 1
+
+
+def _ring_lastn(ring: Dict, n: int) -> List[float]:
+    # The most recent min(n, count) values, oldest first.
+    buf = ring["buf"]
+    count = ring["count"]
+    if n > count:
+        n = count
+    start = ring["head"] - n
+    if start >= 0:
+        return buf[start:start + n]
+    return buf[start:] + buf[:ring["head"]]
+
+
+def is_in_stable_pocket(current_price: float, rolling_mean: float, rolling_std: float,
+                        std_threshold: float) -> bool:
+    # Pure comparison on the cached rolling stats; the window sums are
+    # maintained incrementally by the caller.
     return rolling_std > std_threshold and abs(current_price - rolling_mean) < rolling_std
 
 
 def normal_cdf(x: float, mean: float, std: float) -> float:
-    """Approximate the CDF of a normal distribution using numpy (via erf)."""
-    z = (x - mean) / (std * np.sqrt(2))
-    return 0.5 * (1 + erf(z))
+    """CDF of a normal distribution via the C-implemented math.erf."""
+    z = (x - mean) / (std * _SQRT2)
+    return 0.5 * (1.0 + erf(z))
+
+
+# Pocket-duration parameters are fixed strategy constants, and t only ever
+# takes small integer values, so the CDF is tabulated once at import; the
+# per-tick risk evaluation becomes two list reads instead of two erf calls.
+_POCKET_MEAN_LEN = 100  # avg pocket duration from offline analysis
+_POCKET_STD_LEN = 30
+_CDF_TABLE = [normal_cdf(t, _POCKET_MEAN_LEN, _POCKET_STD_LEN) for t in range(411)]
 
 
 def pocket_transition_risk(t: int, mean_len: float, std_len: float, horizon: int = 10) -> float:
     """Probability that the pocket ends in the next `horizon` timesteps."""
+    if (mean_len == _POCKET_MEAN_LEN and std_len == _POCKET_STD_LEN
+            and 0 <= t and t + horizon < len(_CDF_TABLE)):
+        return _CDF_TABLE[t + horizon] - _CDF_TABLE[t]
+    # Fallback for out-of-table t or non-default parameters
     p_now = normal_cdf(t, mean_len, std_len)
     p_future = normal_cdf(t + horizon, mean_len, std_len)
     return p_future - p_now
 
 
 class Trader:
+    def __init__(self):
+        # Resident copy of traderData; the instance persists across ticks,
+        # so json.loads only runs on a cold start (fresh process)
+        self._state = None
+
     def run(self, state: TradingState):
-        result = {}
+        # Preallocate one empty order list per product up front
+        result = {product: [] for product in state.order_depths}
 
-        # Load previous state from traderData
-        try:
-            trader_data = json.loads(state.traderData) if state.traderData else {}
-        except Exception:
-            trader_data = {}
+        # Load previous state from traderData only on a cold start
+        if self._state is None:
+            try:
+                self._state = json.loads(state.traderData) if state.traderData else {}
+            except Exception:
+                self._state = {}
+        trader_data = self._state
 
         max_position = 50
         window = 30
@@ -62,11 +95,14 @@ class Trader:
         std_len = 30
 
         for product, order_depth in state.order_depths.items():
-            orders: List[Order] = []
+            orders = result[product]
             current_position = state.position.get(product, 0)
 
-            best_ask = min(order_depth.sell_orders.keys(), default=None)
-            best_bid = max(order_depth.buy_orders.keys(), default=None)
+            # Best ask/bid and their volumes in one pass per book side
+            best_ask_item = min(order_depth.sell_orders.items(), default=None)
+            best_bid_item = max(order_depth.buy_orders.items(), default=None)
+            best_ask, ask_vol = best_ask_item if best_ask_item else (None, 0)
+            best_bid, bid_vol = best_bid_item if best_bid_item else (None, 0)
 
             if best_ask is None and best_bid is None:
                 continue
@@ -87,17 +123,41 @@ class Trader:
             })
 
             price_history = product_data["price_history"]
+            if not isinstance(price_history, dict):
+                # Migrate older blobs that stored a plain list
+                price_history = _ring_new(200, price_history)
             time_in_pocket = product_data["time_in_pocket"]
             in_pocket = product_data["in_pocket"]
 
-            price_history.append(mid_price)
-            if len(price_history) > 200:
-                price_history.pop(0)
-
-            current_in_pocket = is_in_stable_pocket(price_history, window=window, std_threshold=std_threshold)
-
-            mean_price = np.mean(price_history[-window:]) if len(price_history) >= window else mid_price
-            std_price = np.std(price_history[-window:]) if len(price_history) >= window else 1.0
+            # Rolling sum / sum-of-squares over the last `window` prices,
+            # updated in O(1) per tick; rebuilt once for older blobs
+            if "roll_sum" in product_data:
+                roll_sum = product_data["roll_sum"]
+                roll_sum_sq = product_data["roll_sum_sq"]
+            else:
+                w = _ring_lastn(price_history, window)
+                roll_sum = sum(w)
+                roll_sum_sq = sum(p * p for p in w)
+
+            # Value about to leave the stats window (only once it is full)
+            if price_history["count"] >= window:
+                buf = price_history["buf"]
+                leaving = buf[(price_history["head"] - window) % len(buf)]
+            else:
+                leaving = 0.0
+            _ring_push(price_history, mid_price)
+            roll_sum += mid_price - leaving
+            roll_sum_sq += mid_price * mid_price - leaving * leaving
+
+            if price_history["count"] >= window:
+                mean_price = roll_sum / window
+                variance = roll_sum_sq / window - mean_price * mean_price
+                std_price = variance ** 0.5 if variance > 0 else 0.0
+                current_in_pocket = is_in_stable_pocket(mid_price, mean_price, std_price, std_threshold)
+            else:
+                mean_price = mid_price
+                std_price = 1.0
+                current_in_pocket = False
 
             if current_in_pocket:
                 time_in_pocket += 1
@@ -121,12 +181,13 @@ class Trader:
 
             product_data.update({
                 "price_history": price_history,
+                "roll_sum": roll_sum,
+                "roll_sum_sq": roll_sum_sq,
                 "time_in_pocket": time_in_pocket,
                 "in_pocket": current_in_pocket
             })
 
             trader_data[product] = product_data
-            result[product] = orders
 
         updated_trader_data = json.dumps(trader_data)
         conversions = 1
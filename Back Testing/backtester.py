@@ -1,3 +1,4 @@
+import numpy as np
 import pandas as pd
 from typing import Dict, List, Type, Any
 import os
@@ -5,29 +6,111 @@ import os
 
 from datamodel import TradingState, Listing, Observation, OrderDepth
 from abc import ABC, abstractmethod
+from concurrent.futures import ProcessPoolExecutor
 import matplotlib.pyplot as plt
+import importlib.util
+import inspect
 import logging
 import json
 import datetime
+import time
+
+def _trade_pnl(quantity, price, market_price):
+    """
+    Numeric core of one fill: cash flow and mark-to-market PnL.
+    Buys profit when the market is above the fill price; sells (negative
+    quantity) profit when it is below.
+    """
+    cash_flow = -quantity * price
+    if quantity > 0:
+        position_value_change = (market_price - price) * quantity
+    else:
+        position_value_change = -(market_price - price) * (-quantity)
+    return cash_flow, position_value_change
+
+
+# Compile the kernel when numba is installed; the backtester is local-only,
+# so a compiled fast path here never conflicts with the single-file
+# pure-Python submission constraint on the algorithm side.
+try:
+    from numba import njit
+    _trade_pnl = njit(cache=True)(_trade_pnl)
+except ImportError:
+    pass
+
+
+def _run_day_partition(backtester_cls, csv_path, trader_path, days):
+    """
+    Worker entry point: backtest one contiguous block of days in its own
+    process, starting from flat positions and empty trader state.
+    """
+    module_name = os.path.splitext(os.path.basename(trader_path))[0]
+    spec = importlib.util.spec_from_file_location(module_name, trader_path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    backtester = backtester_cls(csv_path, module.Trader, logger_level=logging.WARNING)
+    backtester.load_data()
+    backtester.data = backtester.data[backtester.data['day'].isin(days)].reset_index(drop=True)
+    backtester.run()
+
+    n = backtester._n_trades
+    trades = {name: column[:n] for name, column in backtester._trades.items()}
+    return n, trades, backtester.current_position, backtester.cash, backtester.pnl_history
+
 
 class BaseBacktester(ABC):
-    def __init__(self, csv_path: str, trader_class: Type, logger_level: int = logging.INFO):
+    def __init__(self, csv_path: str, trader_class: Type, logger_level: int = logging.INFO,
+                 parallel_days: bool = False):
         """
         Initialize the backtester with data path and trader class
-        
+
         Args:
             csv_path: Path to the CSV file containing market data
             trader_class: The trader class to backtest
             logger_level: Logging level (default: INFO)
+            parallel_days: Run each day partition in a separate process.
+                Only sound for traders that carry no state across day
+                boundaries — every worker starts from flat positions,
+                zero cash and empty trader_data.
         """
         self.csv_path = csv_path
         self.trader_class = trader_class
+        self.parallel_days = parallel_days
         self.trader_instance = None
         self.data = None
-        self.current_position: Dict[str, int] = {}
+        # Positions live in a flat int64 array indexed by product; the
+        # dict shape TradingState expects is built on demand
+        self._products: List[str] = []
+        self._product_index: Dict[str, int] = {}
+        self._positions = None
         self.cash = 0
-        self.trades_history: List[Dict] = []
         self.pnl_history: List[float] = []
+
+        # Trade history as a structure-of-arrays: one preallocated column
+        # per field, grown geometrically. A dict per trade carries a hash
+        # table and a Python object per field; columns cost eight bytes per
+        # numeric value and give analyze_performance arrays directly.
+        # Serialized-form cache for non-string trader_data blobs
+        self._trader_data_obj = None
+        self._trader_data_json = ""
+
+        # Mid-price pivot reused across analyze_performance calls
+        self._price_lookup = None
+
+        self._trade_capacity = 1024
+        self._n_trades = 0
+        self._trades = {
+            'timestamp': np.empty(self._trade_capacity, np.int64),
+            'product': np.empty(self._trade_capacity, object),
+            'quantity': np.empty(self._trade_capacity, np.int64),
+            'price': np.empty(self._trade_capacity, np.float64),
+            'cash_flow': np.empty(self._trade_capacity, np.float64),
+            'position_value_change': np.empty(self._trade_capacity, np.float64),
+            'pnl': np.empty(self._trade_capacity, np.float64),
+            'position': np.empty(self._trade_capacity, np.int64),
+            'market_price': np.empty(self._trade_capacity, np.float64),
+        }
         
         # Setup logging
         log_dir = 'logs'
@@ -73,8 +156,52 @@ class BaseBacktester(ABC):
         """Load and preprocess the market data"""
         self.logger.info(f"Loading data from {self.csv_path}")
         self.data = self.preprocess_data()
+        self._price_lookup = None
+        self._index_depth_columns(self.data)
+        products = self.data['product'].unique()
+        self._products = list(products)
+        self._product_index = {product: i for i, product in enumerate(products)}
+        self._positions = np.zeros(len(products), np.int64)
+
+        # Shared per-run TradingState furniture: listings never change, the
+        # trade maps stay empty (this backtester feeds snapshots only) and
+        # every trader in this repo reads them without mutating
+        self._listings = {product: Listing(symbol=product, product=product, denomination="USDT")
+                          for product in products}
+        self._empty_trades = {product: [] for product in products}
+        self._empty_observation = Observation(plainValueObservations={}, conversionObservations={})
+
         self.logger.info(f"Loaded {len(self.data)} market data points")
-        
+
+    @property
+    def current_position(self) -> Dict[str, int]:
+        """Positions as a fresh product->quantity dict built from the array."""
+        if self._positions is None:
+            return {}
+        return {product: int(quantity)
+                for product, quantity in zip(self._products, self._positions)}
+
+    def _index_depth_columns(self, df: pd.DataFrame):
+        """
+        Record which bid/ask price/volume columns exist and where they sit in
+        the depth matrix, so run() can pull them out of the DataFrame once per
+        group instead of doing pandas scalar lookups per row.
+        """
+        depth_cols = []
+        bid_levels = []
+        ask_levels = []
+        for side, levels in (('bid', bid_levels), ('ask', ask_levels)):
+            for i in range(1, 4):
+                price_col = f'{side}_price_{i}'
+                volume_col = f'{side}_volume_{i}'
+                if price_col in df.columns and volume_col in df.columns:
+                    levels.append((len(depth_cols), len(depth_cols) + 1))
+                    depth_cols.append(price_col)
+                    depth_cols.append(volume_col)
+        self._depth_cols = depth_cols
+        self._bid_levels = bid_levels
+        self._ask_levels = ask_levels
+
     def create_order_depth(self, row: pd.Series) -> OrderDepth:
         """Create order depth dictionary from a data row"""
         order_depth = OrderDepth()
@@ -94,7 +221,28 @@ class BaseBacktester(ABC):
                 order_depth.sell_orders[float(ask_price)] = int(ask_volume)
                 
         return order_depth
-    
+
+    def _order_depth_from_row(self, values: np.ndarray) -> OrderDepth:
+        """
+        Build an OrderDepth from one row of the float64 depth matrix.
+        Missing levels show up as NaN; `x == x` is the scalar NaN test,
+        cheaper than np.isnan on single floats.
+        """
+        order_depth = OrderDepth()
+        buy_orders = order_depth.buy_orders
+        sell_orders = order_depth.sell_orders
+        for pi, vi in self._bid_levels:
+            price = values[pi]
+            volume = values[vi]
+            if price == price and volume == volume:
+                buy_orders[float(price)] = int(volume)
+        for pi, vi in self._ask_levels:
+            price = values[pi]
+            volume = values[vi]
+            if price == price and volume == volume:
+                sell_orders[float(price)] = int(volume)
+        return order_depth
+
     def create_trading_state(self, timestamp: int, 
                            order_depths: Dict[str, Dict], 
                            own_trades: Dict[str, List], 
@@ -102,42 +250,36 @@ class BaseBacktester(ABC):
                            position: Dict[str, int],
                            observations: Dict[str, Any]) -> TradingState:
         """Create a TradingState object from current market state"""
-        # Create empty listings dictionary for each product
-        listings = {}
-        
-        # Initialize empty trade lists for each product
-        empty_own_trades = {product: [] for product in order_depths.keys()}
-        empty_market_trades = {product: [] for product in order_depths.keys()}
-        
-        # Create listings for each product
-        for product in order_depths.keys():
-            listings[product] = Listing(symbol=product, product=product, denomination="USDT")
-            
-        # Create empty Observation object
-        empty_observation = Observation(plainValueObservations={}, conversionObservations={})
-        
-        # Convert trader data to JSON string if it exists
-        if isinstance(self.trader_data, str):
-            trader_data = self.trader_data
-        else:
-            trader_data = json.dumps(self.trader_data)
-        
+        # Listings, empty trade maps and the Observation are built once in
+        # load_data and shared across ticks
+        # Traders hand their state back as a string, which passes through
+        # verbatim; a non-string blob is serialized once and the JSON
+        # cached until the object is replaced
+        trader_data = self.trader_data
+        if not isinstance(trader_data, str):
+            if trader_data is not self._trader_data_obj:
+                self._trader_data_obj = trader_data
+                self._trader_data_json = json.dumps(trader_data)
+            trader_data = self._trader_data_json
+
         return TradingState(
             traderData=trader_data,
             timestamp=timestamp,
-            listings=listings,
+            listings=self._listings,
             order_depths=order_depths,
-            own_trades=empty_own_trades,
-            market_trades=empty_market_trades,
+            own_trades=self._empty_trades,
+            market_trades=self._empty_trades,
             position=position,
-            observations=empty_observation
+            observations=self._empty_observation
         )
     
-    def execute_trades(self, orders: Any, 
-                      current_prices: Dict[str, float],
+    def execute_trades(self, orders: Any,
+                      price_row: np.ndarray,
                       timestamp: int) -> float:
         """
         Execute trades and calculate PnL
+        `price_row` is one row of the (tick x product) mid-price matrix,
+        indexed by the product index built in load_data.
         Returns the PnL for this round of trades
         """
         round_pnl = 0
@@ -145,88 +287,152 @@ class BaseBacktester(ABC):
         # Convert tuple return (orders, conversions, trader_data) to just orders
         if isinstance(orders, tuple):
             orders, _, trader_data = orders
-            if isinstance(trader_data, str):
-                try:
-                    self.trader_data = json.loads(trader_data)
-                except json.JSONDecodeError:
-                    self.trader_data = {}
-            else:
-                self.trader_data = trader_data
-            
+            # The backtester never reads into the blob, so a returned string
+            # is kept verbatim instead of being parsed and re-dumped per tick
+            self.trader_data = trader_data if trader_data is not None else ""
+
         # Handle empty orders
         if not orders:
             return 0.0
             
+        # Resolve the log level once; when INFO is filtered out the loop
+        # below skips string formatting entirely
+        log_info = self.logger.isEnabledFor(logging.INFO)
+
         # Handle dictionary of orders
         if isinstance(orders, dict):
             for product, product_orders in orders.items():
                 if not product_orders:  # Skip empty order lists
                     continue
+                product_idx = self._product_index[product]
+                market_price = price_row[product_idx]
                 for order in product_orders:
                     # Update position and cash
-                    old_position = self.current_position.get(product, 0)
-                    self.current_position[product] = old_position + order.quantity
-                    
-                    # Calculate trade cash flow (negative for buys, positive for sells)
-                    cash_flow = -order.quantity * order.price
+                    self._positions[product_idx] += order.quantity
+                    new_position = self._positions[product_idx]
+
+                    # Cash flow (negative for buys) and mark-to-market PnL
+                    # come from the module-level numeric kernel
+                    cash_flow, position_value_change = _trade_pnl(
+                        order.quantity, order.price, market_price)
                     self.cash += cash_flow
-                    
-                    # Log trade details similar to what's in the trader logs
-                    trade_type = "BUY" if order.quantity > 0 else "SELL"
-                    self.logger.info(f"--> {product}: Placing {trade_type} order for {abs(order.quantity)} units at {order.price}")
-                    
-                    # Calculate trade PnL based on market price
-                    if order.quantity > 0:  # Buy order
-                        position_value_change = (current_prices[product] - order.price) * order.quantity
-                    else:  # Sell order
-                        # For short selling, we make money when price goes down after we sell
-                        # If current price is higher than sell price, that's a loss
-                        position_value_change = -(current_prices[product] - order.price) * abs(order.quantity)
+
                     trade_pnl = position_value_change
                     round_pnl += trade_pnl
-                    
-                    # Log PnL information
-                    pnl_status = "PROFIT" if position_value_change > 0 else "LOSS" if position_value_change < 0 else "BREAK EVEN"
-                    self.logger.info(f"    Trade PnL: {position_value_change:.2f} ({pnl_status}) | Market price: {current_prices[product]} | New position: {self.current_position[product]}")
-                    
-                    # Record trade
-                    self.trades_history.append({
-                        'timestamp': str(timestamp),
-                        'product': product,
-                        'quantity': order.quantity,
-                        'price': order.price,
-                        'cash_flow': cash_flow,
-                        'position_value_change': position_value_change,
-                        'pnl': trade_pnl,
-                        'position': self.current_position[product],
-                        'market_price': current_prices[product]
-                    })
-                    
+
+                    if log_info:
+                        # Log trade details similar to what's in the trader logs
+                        trade_type = "BUY" if order.quantity > 0 else "SELL"
+                        self.logger.info("--> %s: Placing %s order for %d units at %s",
+                                         product, trade_type, abs(order.quantity), order.price)
+                        pnl_status = "PROFIT" if position_value_change > 0 else "LOSS" if position_value_change < 0 else "BREAK EVEN"
+                        self.logger.info("    Trade PnL: %.2f (%s) | Market price: %s | New position: %s",
+                                         position_value_change, pnl_status, market_price, new_position)
+
+                    # Record trade into the next free slot of each column
+                    i = self._n_trades
+                    if i == self._trade_capacity:
+                        self._grow_trades()
+                    trades = self._trades
+                    trades['timestamp'][i] = timestamp
+                    trades['product'][i] = product
+                    trades['quantity'][i] = order.quantity
+                    trades['price'][i] = order.price
+                    trades['cash_flow'][i] = cash_flow
+                    trades['position_value_change'][i] = position_value_change
+                    trades['pnl'][i] = trade_pnl
+                    trades['position'][i] = new_position
+                    trades['market_price'][i] = market_price
+                    self._n_trades = i + 1
+
         return round_pnl
+
+    def _grow_trades(self):
+        """Double the capacity of the columnar trade history."""
+        new_capacity = self._trade_capacity * 2
+        for name, column in self._trades.items():
+            grown = np.empty(new_capacity, column.dtype)
+            grown[:self._trade_capacity] = column
+            self._trades[name] = grown
+        self._trade_capacity = new_capacity
+
+    def _trades_frame(self) -> pd.DataFrame:
+        """Materialize the recorded trades as a DataFrame, one copy per column."""
+        n = self._n_trades
+        frame = pd.DataFrame({name: column[:n] for name, column in self._trades.items()})
+        # Categorical products make the per-product groupby run on integer
+        # codes instead of hashing strings
+        frame['product'] = frame['product'].astype('category')
+        return frame
     
     def run(self):
         """Run the backtesting simulation"""
         if self.data is None:
             self.load_data()
-            
+
+        if self.parallel_days:
+            days = np.sort(self.data['day'].unique())
+            if len(days) > 1:
+                self._run_parallel(days)
+                return
+            self.logger.info("parallel_days requested but data has a single day; running serially")
+
         self.trader_instance = self.trader_class()
         self.logger.info("Starting backtest simulation")
+
+        # Pre-warm on a throwaway instance with an empty state so one-time
+        # costs (lazy imports, JIT compilation of trader kernels) are paid
+        # before the measured loop; module-level caches survive the
+        # instance, and the real trader never sees the dummy tick
+        warmup_start = time.perf_counter()
+        try:
+            self.trader_class().run(TradingState(
+                traderData="", timestamp=0, listings={}, order_depths={},
+                own_trades={}, market_trades={}, position={},
+                observations=self._empty_observation))
+        except Exception as e:
+            self.logger.debug(f"Trader warm-up call failed: {e}")
+        self.logger.info(f"Trader warm-up took {time.perf_counter() - warmup_start:.3f}s")
         
         # Initialize trader data as a dictionary
         self.trader_data = {}
         
-        # Group data by timestamp
-        grouped_data = self.data.groupby(['day', 'timestamp'])
-        
-        for (day, timestamp), group in grouped_data:
-            # Prepare order depths for all products
+        # Pull every needed column out as an ndarray once; preprocess_data
+        # already sorted by (day, timestamp), so group boundaries are just
+        # the rows where either key changes — no groupby, no iterrows
+        day_arr = self.data['day'].to_numpy()
+        ts_arr = self.data['timestamp'].to_numpy()
+        products = self.data['product'].to_numpy()
+        mids = self.data['mid_price'].to_numpy()
+        depth_arr = self.data[self._depth_cols].to_numpy(dtype=np.float64, copy=False)
+
+        if len(ts_arr) == 0:
+            self.logger.warning("No market data rows to simulate")
+            return
+
+        change = (np.diff(day_arr) != 0) | (np.diff(ts_arr) != 0)
+        boundaries = np.r_[0, np.flatnonzero(change) + 1, len(ts_arr)]
+
+        # (tick x product) mid-price matrix built once up front, so
+        # execute_trades reads market prices by integer index instead of
+        # rebuilding a product->price dict every timestamp
+        n_ticks = len(boundaries) - 1
+        row_of_tick = np.repeat(np.arange(n_ticks), np.diff(boundaries))
+        col_of_row = np.fromiter(
+            (self._product_index[p] for p in products), np.int64, len(products))
+        prices_matrix = np.full((n_ticks, len(self._products)), np.nan)
+        prices_matrix[row_of_tick, col_of_row] = mids
+
+        for b in range(n_ticks):
+            start = boundaries[b]
+            end = boundaries[b + 1]
+            day = day_arr[start]
+            timestamp = ts_arr[start]
+
+            # Prepare order depths for all products in this timestamp slice
             order_depths = {}
-            current_prices = {}
-            
-            for _, row in group.iterrows():
-                product = row['product']
-                order_depths[product] = self.create_order_depth(row)
-                current_prices[product] = row['mid_price']
+            for i in range(start, end):
+                order_depths[products[i]] = self._order_depth_from_row(depth_arr[i])
             
             # Create trading state
             state = self.create_trading_state(
@@ -234,21 +440,61 @@ class BaseBacktester(ABC):
                 order_depths=order_depths,
                 own_trades={},  # Empty for now, could be enhanced
                 market_trades={},  # Empty for now, could be enhanced
-                position=self.current_position.copy(),
+                position=self.current_position,
                 observations={}  # Could be enhanced with additional market data
             )
             
             # Get trading decisions
             try:
                 result = self.trader_instance.run(state)
-                round_pnl = self.execute_trades(result, current_prices, timestamp)
+                round_pnl = self.execute_trades(result, prices_matrix[b], timestamp)
                 self.pnl_history.append(round_pnl)
             except Exception as e:
                 self.logger.error(f"Error during trading at day {day}, timestamp {timestamp}: {str(e)}")
                 continue
                 
         self.logger.info("Backtest simulation completed")
-        
+
+    def _run_parallel(self, days):
+        """
+        Backtest contiguous day partitions in separate processes and merge
+        the per-day results. Each worker reloads the trader from its source
+        file and simulates from a clean slate, so this matches the serial
+        run only for traders without cross-day state.
+        """
+        try:
+            trader_path = inspect.getfile(self.trader_class)
+        except TypeError:
+            # Dynamically loaded traders never register in sys.modules, so
+            # resolve the source file through run()'s code object instead
+            trader_path = inspect.getfile(self.trader_class.run)
+        n_workers = min(len(days), os.cpu_count() or 1)
+        partitions = [part for part in np.array_split(days, n_workers) if len(part)]
+        self.logger.info(f"Running {len(days)} days across {len(partitions)} processes")
+
+        with ProcessPoolExecutor(max_workers=n_workers) as pool:
+            futures = [pool.submit(_run_day_partition, type(self), self.csv_path,
+                                   trader_path, list(partition))
+                       for partition in partitions]
+            partition_results = [future.result() for future in futures]
+
+        # Merge in day order: trades concatenate, positions/cash/PnL sum
+        total_trades = sum(result[0] for result in partition_results)
+        while self._trade_capacity < total_trades:
+            self._grow_trades()
+        offset = 0
+        for n, trades, positions, cash, pnl_history in partition_results:
+            for name, column in trades.items():
+                self._trades[name][offset:offset + n] = column
+            offset += n
+            for product, quantity in positions.items():
+                self._positions[self._product_index[product]] += quantity
+            self.cash += cash
+            self.pnl_history.extend(pnl_history)
+        self._n_trades = total_trades
+
+        self.logger.info("Backtest simulation completed")
+
     def calculate_portfolio_value(self, current_prices: Dict[str, float]) -> float:
         """Calculate total portfolio value including cash and positions"""
         total_value = self.cash  # Start with cash
@@ -263,63 +509,54 @@ class BaseBacktester(ABC):
         
     def analyze_performance(self):
         """Analyze trading performance and generate insights"""
-        if not self.trades_history:
+        if self._n_trades == 0:
             self.logger.warning("No trades to analyze")
             return
-        
+
         # Convert trades history to DataFrame
-        trades_df = pd.DataFrame(self.trades_history)
-        
-        # Create a DataFrame with all timestamps from the original data
-        all_timestamps = self.data[['timestamp']].drop_duplicates().sort_values('timestamp')
-        portfolio_df = pd.DataFrame(index=all_timestamps['timestamp'])
-        
-        # Initialize tracking variables
-        current_cash = 0
-        current_positions = {}
-        
-        # Track portfolio value at each timestamp
-        portfolio_values = []
-        timestamps = []
-        
-        for timestamp in all_timestamps['timestamp']:
-            # Update cash and positions with any trades at this timestamp
-            trades_at_ts = trades_df[trades_df['timestamp'] == str(timestamp)]
-            if not trades_at_ts.empty:
-                current_cash += trades_at_ts['cash_flow'].sum()
-                for _, trade in trades_at_ts.iterrows():
-                    current_positions[trade['product']] = trade['position']
-            
-            # Get current market prices
-            current_prices = {}
-            for product in self.data[self.data['timestamp'] == timestamp]['product'].unique():
-                price = self.data[(self.data['timestamp'] == timestamp) & 
-                                (self.data['product'] == product)]['mid_price'].iloc[0]
-                current_prices[product] = price
-            
-            # Calculate total portfolio value (cash + position values)
-            position_value = sum(pos * current_prices.get(prod, 0) 
-                               for prod, pos in current_positions.items())
-            portfolio_value = current_cash + position_value
-            
-            portfolio_values.append(portfolio_value)
-            timestamps.append(timestamp)
-        
+        trades_df = self._trades_frame()
+        
+        # The whole portfolio-value series comes from three vectorized
+        # reshapes instead of a Python loop over timestamps:
+        #   prices    — (timestamp x product) mid-price grid
+        #   cum_cash  — cash flow per timestamp, accumulated
+        #   positions — per-product signed quantity, accumulated
+        if self._price_lookup is None:
+            self._price_lookup = self.data.pivot_table(
+                index='timestamp', columns='product', values='mid_price')
+        prices = self._price_lookup
+        timestamps = prices.index.to_numpy()
+
+        cash_by_ts = trades_df.groupby('timestamp')['cash_flow'].sum().reindex(
+            prices.index, fill_value=0)
+        cum_cash = cash_by_ts.cumsum().to_numpy()
+
+        traded_qty = trades_df.pivot_table(
+            index='timestamp', columns='product', values='quantity', aggfunc='sum')
+        positions = traded_qty.reindex(
+            index=prices.index, columns=prices.columns, fill_value=0).fillna(0).cumsum()
+
+        position_values = (positions.to_numpy() * np.nan_to_num(prices.to_numpy())).sum(axis=1)
+        portfolio_values = cum_cash + position_values
+
+        # Final state for the summary logs below
+        current_cash = float(cum_cash[-1])
+        final_positions = positions.iloc[-1]
+        current_positions = {product: int(final_positions[product]) for product in traded_qty.columns}
+        last_prices = prices.iloc[-1]
+        current_prices = {product: price for product, price in last_prices.items()
+                          if pd.notna(price)}
+
         # Plot portfolio value over time
         plt.figure(figsize=(15, 8))
         plt.plot(range(len(timestamps)), portfolio_values, label='Portfolio Value', linewidth=2)
-        
+
         # Add markers for trades
-        trade_indices = []
-        trade_values = []
-        for ts in trades_df['timestamp'].unique():
-            try:
-                idx = timestamps.index(int(ts))
-                trade_indices.append(idx)
-                trade_values.append(portfolio_values[idx])
-            except (ValueError, IndexError):
-                continue
-        
+        unique_trade_ts = np.unique(trades_df['timestamp'].to_numpy())
+        trade_indices = np.searchsorted(timestamps, unique_trade_ts)
+        trade_indices = trade_indices[(trade_indices < len(timestamps))]
+        trade_values = portfolio_values[trade_indices]
+
         plt.scatter(trade_indices, trade_values, color='red', label='Trades', zorder=5)
         
         plt.title('Portfolio Value Over Time')
@@ -332,13 +569,22 @@ class BaseBacktester(ABC):
         plt.savefig('portfolio_value.png')
         plt.close()
         
+        # Win/loss classification in one pass over the PnL column; the
+        # counts feed both the log lines and the returned summary
+        pvc = trades_df['position_value_change'].to_numpy()
+        n_total = len(pvc)
+        n_profitable = int((pvc > 0).sum())
+        n_losing = int((pvc < 0).sum())
+        n_breakeven = n_total - n_profitable - n_losing
+        total_realized_pnl = float(pvc.sum())
+
         # Print analysis
         self.logger.info("\n=== Performance Analysis ===")
-        self.logger.info(f"Total Trades: {len(trades_df)}")
+        self.logger.info(f"Total Trades: {n_total}")
         self.logger.info(trades_df)
-        self.logger.info(f"Profitable Trades: {len(trades_df[trades_df['position_value_change'] > 0])} ({len(trades_df[trades_df['position_value_change'] > 0])/len(trades_df)*100:.2f}%)")
-        self.logger.info(f"Loss Making Trades: {len(trades_df[trades_df['position_value_change'] < 0])} ({len(trades_df[trades_df['position_value_change'] < 0])/len(trades_df)*100:.2f}%)")
-        self.logger.info(f"Break Even Trades: {len(trades_df[trades_df['position_value_change'] == 0])} ({len(trades_df[trades_df['position_value_change'] == 0])/len(trades_df)*100:.2f}%)")
+        self.logger.info(f"Profitable Trades: {n_profitable} ({n_profitable/n_total*100:.2f}%)")
+        self.logger.info(f"Loss Making Trades: {n_losing} ({n_losing/n_total*100:.2f}%)")
+        self.logger.info(f"Break Even Trades: {n_breakeven} ({n_breakeven/n_total*100:.2f}%)")
         
         self.logger.info("\n=== Portfolio Summary ===")
         final_portfolio_value = portfolio_values[-1]
@@ -361,14 +607,14 @@ class BaseBacktester(ABC):
         self.logger.info(product_analysis)
         
         return {
-            'total_trades': len(trades_df),
-            'profitable_trades': len(trades_df[trades_df['position_value_change'] > 0]),
-            'loss_making_trades': len(trades_df[trades_df['position_value_change'] < 0]),
-            'break_even_trades': len(trades_df[trades_df['position_value_change'] == 0]),
+            'total_trades': n_total,
+            'profitable_trades': n_profitable,
+            'loss_making_trades': n_losing,
+            'break_even_trades': n_breakeven,
             'final_portfolio_value': final_portfolio_value,
             'total_cash': current_cash,
-            'total_realized_pnl': trades_df['position_value_change'].sum(),
-            'unrealized_pnl': final_portfolio_value - current_cash - trades_df['position_value_change'].sum(),
+            'total_realized_pnl': total_realized_pnl,
+            'unrealized_pnl': final_portfolio_value - current_cash - total_realized_pnl,
             'product_analysis': product_analysis
         }
 
@@ -377,8 +623,15 @@ class Round1Backtester(BaseBacktester):
         """
         Preprocess Round 1 specific CSV data
         """
-        df = pd.read_csv(self.csv_path, sep=';')
-        
+        # Read the header alone to discover the price/volume columns, then
+        # parse the file once with explicit float64 dtypes — no per-column
+        # to_numeric rescan afterwards
+        header = pd.read_csv(self.csv_path, sep=';', nrows=0)
+        numeric_columns = [col for col in header.columns
+                           if 'price' in col or 'volume' in col]
+        df = pd.read_csv(self.csv_path, sep=';',
+                         dtype={col: 'float64' for col in numeric_columns})
+
         # Ensure required columns exist
         required_columns = [
             'day', 'timestamp', 'product',
@@ -386,27 +639,16 @@ class Round1Backtester(BaseBacktester):
             'ask_price_1', 'ask_volume_1',
             'mid_price'
         ]
-        
+
         missing_columns = [col for col in required_columns if col not in df.columns]
         if missing_columns:
             raise ValueError(f"Missing required columns: {missing_columns}")
-            
-        # Convert price and volume columns to numeric
-        price_columns = [col for col in df.columns if 'price' in col]
-        volume_columns = [col for col in df.columns if 'volume' in col]
-        
-        for col in price_columns + volume_columns:
-            df[col] = pd.to_numeric(df[col], errors='coerce')
-            
+
         # Validate price data
         df = df.dropna(subset=['mid_price'])  # Remove rows with invalid mid prices
         
         # Sort by timestamp to ensure chronological order
+        # (positions start at zero; load_data sizes the position array)
         df = df.sort_values(['day', 'timestamp'])
-        
-        # Initialize positions to 0 for each product
-        products = df['product'].unique()
-        for product in products:
-            self.current_position[product] = 0
-            
-        return df 
\ No newline at end of file
+
+        return df
@@ -1,5 +1,5 @@
 # key is from, values are to
-from collections import deque
+import numpy as np
 
 
 conversion_rates = {
@@ -14,11 +14,19 @@ max_trades = 5
 
 # make trades starting at seashells and ending at seashells... maximuze the amount of seashells at end
 
+currencies = list(conversion_rates)
+# Working in log space turns the path product into a sum, so the best
+# k-trade path is a Bellman-style DP over the 4x4 log-rate matrix instead
+# of enumerating all 4^k paths
+log_rates = np.log(np.array([[conversion_rates[a][b] for b in currencies]
+                             for a in currencies]))
+
+
 def calculate_path_multiplier(path):
     """Calculate the total multiplier for a given path of trades."""
     if len(path) <= 1:
         return 1.0
-    
+
     total_multiplier = 1.0
     for i in range(len(path) - 1):
         from_currency = path[i]
@@ -27,71 +35,57 @@ def calculate_path_multiplier(path):
         total_multiplier *= multiplier
     return total_multiplier
 
+
 def find_best_path(max_trades):
-    """Find the path with the highest return multiplier."""
-    def generate_paths(current_path, trades_left):
-        if trades_left == 0:
-            if current_path[-1] == "Seashells":  # Only consider paths that end in Seashells
-                return [current_path]
-            return []
-        
-        paths = []
-        for next_currency in conversion_rates[current_path[-1]]:
-            new_path = current_path + [next_currency]
-            paths.extend(generate_paths(new_path, trades_left - 1))
-        return paths
-    
-    # Generate all possible paths starting and ending with Seashells
-    all_paths = generate_paths(["Seashells"], max_trades)
-    
-    # Calculate multiplier for each path
-    best_path = None
-    best_multiplier = 0
-    
-    for path in all_paths:
-        multiplier = calculate_path_multiplier(path)
-        if multiplier > best_multiplier:
-            best_multiplier = multiplier
-            best_path = path
-    
-    return best_path, best_multiplier
-
-def bfs(available_capital, max_trades):
-    # Initialize the amount of seashells at the start
-    current_capital = available_capital
-    
-    # Initialize a queue for BFS with (item, capital, trades_count, path)
-    queue = deque([("Seashells", current_capital, 0, [("Seashells", current_capital)])])
-    
-    # Keep track of the best result
-    best_result = (current_capital, [("Seashells", current_capital)])
-    
-    # Process each state in the queue
-    while queue:
-        current_item, current_capital, current_trades, current_path = queue.popleft()
-        
-        # If we've reached max trades and current item is Seashells, check if it's the best result
-        if current_trades == max_trades and current_item == "Seashells":
-            if current_capital > best_result[0]:
-                best_result = (current_capital, current_path)
-            continue
-        elif current_trades == max_trades:
-            continue
-            
-        # Calculate the amount of each item we can buy
-        for item, conversion_rate in conversion_rates[current_item].items():
-            new_capital = current_capital * conversion_rate
-            new_path = current_path + [(item, new_capital)]
-            queue.append((item, new_capital, current_trades + 1, new_path))
-    
-    return best_result[1]  # Return the path that gives maximum profit
-
-# Run both methods and compare results
-print("BFS Method Result:")
-bfs_path = bfs(available_capital, max_trades)
-print(f"Final amount: {bfs_path[-1][1]}")
+    """
+    Find the Seashells -> Seashells path of exactly max_trades trades with
+    the highest return multiplier.
+
+    DP over trade count: best[j] is the best log-multiplier of any path
+    reaching currency j in k trades, parent[k, j] the predecessor that
+    achieved it. 16 multiplies per trade instead of a 4^k tree walk, so
+    arbitrary depths stay instant.
+    """
+    n = len(currencies)
+    start = currencies.index("Seashells")
+
+    best = np.full(n, -np.inf)
+    best[start] = 0.0
+    parent = np.zeros((max_trades, n), dtype=np.int64)
+
+    for k in range(max_trades):
+        candidates = best[:, None] + log_rates  # candidates[i, j]: via i to j
+        parent[k] = np.argmax(candidates, axis=0)
+        best = candidates[parent[k], np.arange(n)]
+
+    # Walk the parents backward from the final Seashells state
+    path_indices = [start]
+    j = start
+    for k in range(max_trades - 1, -1, -1):
+        j = parent[k, j]
+        path_indices.append(j)
+    path = [currencies[i] for i in reversed(path_indices)]
+
+    return path, float(np.exp(best[start]))
+
+
+def best_path_amounts(available_capital, max_trades):
+    """The best path as (item, running capital) steps, like the old BFS output."""
+    path, _ = find_best_path(max_trades)
+    capital = available_capital
+    steps = [(path[0], capital)]
+    for i in range(len(path) - 1):
+        capital *= conversion_rates[path[i]][path[i + 1]]
+        steps.append((path[i + 1], capital))
+    return steps
+
+
+# Report the best path with running amounts, then the bare multiplier
+print("DP Method Result:")
+dp_path = best_path_amounts(available_capital, max_trades)
+print(f"Final amount: {dp_path[-1][1]}")
 print("Path taken:")
-for item, amount in bfs_path:
+for item, amount in dp_path:
     print(f"{item}: {amount:,.2f}")
 
 print("\nBest Multiplier Path:")
@@ -99,4 +93,3 @@ best_path, best_multiplier = find_best_path(max_trades)
 print(f"Best path: {' -> '.join(best_path)}")
 print(f"Multiplier: {best_multiplier:.4f}")
 print(f"Starting with {available_capital:,.2f} would yield: {available_capital * best_multiplier:,.2f}")
-    
\ No newline at end of file
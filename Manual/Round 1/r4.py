@@ -38,41 +38,50 @@ raw = [
 df = pd.DataFrame(raw, columns=["name", "multiplier", "inhabitants"])
 n = len(df)
 
+MULTIPLIERS = df["multiplier"].to_numpy(dtype=float)
+INHABITANTS = df["inhabitants"].to_numpy(dtype=float)
+
 # Initialize with a distribution that considers both multiplier and inhabitants
 def initialize_shares():
     # Consider both multiplier and inhabitants in initial weighting
-    weights = df["multiplier"].values / (df["inhabitants"].values ** 0.5)
+    weights = MULTIPLIERS / (INHABITANTS ** 0.5)
     shares = weights / weights.sum()
     return shares
 
-# EV function with behavioral noise
+# EV function with behavioral noise; shares may carry leading batch axes,
+# with noise_level broadcasting against them
 def expected_value(shares, noise_level=0.1):
-    base_ev = BASE * df["multiplier"].values / (df["inhabitants"].values + 100 * shares)
+    base_ev = BASE * MULTIPLIERS / (INHABITANTS + 100 * shares)
     # Add multiplicative noise to represent behavioral uncertainty
-    noise = 1 + noise_level * np.random.randn(len(shares))
+    noise = 1 + noise_level * np.random.randn(*np.shape(shares))
     return base_ev * noise
 
-# Improved replicator dynamics with behavioral factors
+# Improved replicator dynamics with behavioral factors. The leading axes
+# of initial_shares are independent runs updated in lockstep; converged
+# runs freeze while the rest keep iterating.
 def replicator(initial_shares, noise_level=0.1, noise_decay=0.95, max_iter=10000, tol=1e-9):
-    shares = initial_shares.copy()
-    current_noise = noise_level
-    
+    shares = np.array(initial_shares, dtype=float)
+    current_noise = np.asarray(noise_level, dtype=float)
+    active = np.ones(shares.shape[:-1], dtype=bool)
+
     for iter in range(max_iter):
         ev = expected_value(shares, current_noise)
-        avg = (shares * ev).sum() + 1e-10
+        avg = (shares * ev).sum(axis=-1, keepdims=True) + 1e-10
         new = shares * ev / avg
         new = 0.8 * new + 0.2 * shares
-        
+
         min_share = 0.00001
         new = np.maximum(new, min_share)
-        new = new / new.sum()
-        
-        if np.max(np.abs(new - shares)) < tol:
-            return new
-            
-        shares = new
-        current_noise *= noise_decay
-        
+        new = new / new.sum(axis=-1, keepdims=True)
+
+        delta = np.abs(new - shares).max(axis=-1)
+        shares = np.where(active[..., None], new, shares)
+        active = active & (delta >= tol)
+        if not active.any():
+            return shares
+
+        current_noise = current_noise * noise_decay
+
     return shares
 
 # Analysis parameters
@@ -80,45 +89,55 @@ noise_levels = [0.05, 0.1, 0.15, 0.2, 0.25, 0.5, 0.75, 1.0]
 rationality_levels = [0.0, 0.25, 0.5, 0.75, 1.0]
 num_simulations = 50
 
-# Storage for results
-all_results = []
-best_combinations = []
-profit_distribution = {}
-
-# Run simulations across noise levels
-for noise in noise_levels:
-    print(f"\nAnalyzing noise level: {noise:.2f}")
-    
-    for sim in range(num_simulations):
-        initial_shares = initialize_shares()
-        full_rational = replicator(initial_shares, noise_level=noise)
-        
-        for lam in rationality_levels:
-            # Blend rational and initial with some randomness
-            shares = (1-lam) * initial_shares + lam * full_rational
-            shares = shares + np.random.normal(0, 0.01, size=len(shares))
-            shares = np.maximum(shares, 0)
-            shares = shares / shares.sum()
-            
-            ev_lam = expected_value(shares, noise_level=noise)
-            
-            # Find best combinations
-            for k in (1,2,3):
-                for combo in itertools.combinations(range(n), k):
-                    profit = ev_lam[list(combo)].sum() - sum(COSTS[:k])
-                    combo_names = ", ".join(sorted([df.loc[i,"name"] for i in combo]))
-                    
-                    all_results.append({
-                        "noise": noise,
-                        "lambda": lam,
-                        "simulation": sim,
-                        "combination": combo_names,
-                        "num_suitcases": k,
-                        "profit": profit
-                    })
-
-# Convert to DataFrame for analysis
-results_df = pd.DataFrame(all_results)
+n_noise = len(noise_levels)
+n_lam = len(rationality_levels)
+
+# All (noise, simulation) replicator runs execute as one batched array
+print(f"Running {n_noise * num_simulations} replicator runs in one batch")
+initial_shares = initialize_shares()
+noise_arr = np.array(noise_levels)[:, None, None]          # (noise, 1, 1)
+init_batch = np.broadcast_to(initial_shares, (n_noise, num_simulations, n)).copy()
+full_rational = replicator(init_batch, noise_level=noise_arr)
+
+# Blend rational and initial with some randomness, one lambda axis
+lams = np.array(rationality_levels)[None, None, :, None]   # (1, 1, lam, 1)
+shares = (1 - lams) * initial_shares + lams * full_rational[:, :, None, :]
+shares = shares + np.random.normal(0, 0.01, size=shares.shape)
+shares = np.maximum(shares, 0)
+shares = shares / shares.sum(axis=-1, keepdims=True)
+
+ev_lam = expected_value(shares, noise_level=noise_arr[..., None])
+
+# Every 1/2/3-suitcase combination as one indicator matrix: profit for
+# all of them is a single matrix product against the EVs
+combos = []
+combo_names = []
+combo_sizes = []
+for k in (1, 2, 3):
+    for combo in itertools.combinations(range(n), k):
+        combos.append(combo)
+        combo_names.append(", ".join(sorted(df.loc[i, "name"] for i in combo)))
+        combo_sizes.append(k)
+
+n_combos = len(combos)
+indicator = np.zeros((n_combos, n))
+for c, combo in enumerate(combos):
+    indicator[c, list(combo)] = 1.0
+combo_costs = np.array([sum(COSTS[:k]) for k in combo_sizes], dtype=float)
+
+profits = ev_lam @ indicator.T - combo_costs  # (noise, sim, lambda, combo)
+
+# Materialize the long-form results table once from the profit tensor
+results_df = pd.DataFrame({
+    "noise": np.repeat(np.array(noise_levels), num_simulations * n_lam * n_combos),
+    "lambda": np.tile(np.repeat(np.array(rationality_levels), n_combos),
+                      n_noise * num_simulations),
+    "simulation": np.tile(np.repeat(np.arange(num_simulations), n_lam * n_combos), n_noise),
+    "combination": np.tile(np.array(combo_names, dtype=object),
+                           n_noise * num_simulations * n_lam),
+    "num_suitcases": np.tile(np.array(combo_sizes), n_noise * num_simulations * n_lam),
+    "profit": profits.ravel(),
+})
 
 # Aggregate results
 def analyze_results(df):
@@ -2,9 +2,9 @@ import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
-from collections import Counter
 import itertools
 from concurrent.futures import ProcessPoolExecutor
+import os
 import time
 
 # Constants
@@ -46,141 +46,184 @@ SUITCASES = [
     ("D5", 30, 2),
 ]
 
+# Per-suitcase columns and cumulative opening costs as module-level arrays,
+# so EV math runs on ndarrays instead of tuple unpacking per suitcase
+SUIT_MULT = np.array([s[1] for s in SUITCASES], dtype=np.float64)
+SUIT_INH = np.array([s[2] for s in SUITCASES], dtype=np.float64)
+COSTS_CUM = np.cumsum(COSTS)
+
+# Every 1-3 element combination of the 8 top candidates, fixed at module
+# load. Rows are padded to width 3 with sentinel slot 8, which maps to a
+# zero EV entry, so combination profits reduce in one fancy-indexed sum.
+_combo_rows = []
+COMBO_LEN = []
+for _k in range(1, 4):
+    for _combo in itertools.combinations(range(8), _k):
+        _combo_rows.append(list(_combo) + [8] * (3 - _k))
+        COMBO_LEN.append(_k)
+COMBO_IDX = np.array(_combo_rows, dtype=np.int64)
+COMBO_LEN = np.array(COMBO_LEN, dtype=np.int64)
+del _combo_rows
+
+# EV math lives in module-level kernels that take arrays plus scalar player
+# parameters, keeping the Player class to decision logic only
+def _suitcase_evs(counts, rationality, risk_tolerance, noise_level, rng):
+    """Perceived EV of every suitcase at the current choice counts."""
+    perception_noise = rng.normal(0, (1 - rationality) * noise_level, len(SUITCASES))
+    evs = BASE * SUIT_MULT * np.reciprocal(SUIT_INH + counts + 1.0)
+    evs *= (1 + perception_noise)
+    risk_factor = 1 - (counts / NUM_PLAYERS) * (1 - risk_tolerance)
+    return evs * risk_factor
+
+
+def _candidate_evs(cand_idx, counts, total_choices, rationality, rng):
+    """Perceived EV of each candidate suitcase under the current counts."""
+    # One divide for the whole decision; the per-candidate denominators
+    # then cost a reciprocal-multiply instead of a division each
+    pct_scale = 100.0 / total_choices
+    ev = BASE * SUIT_MULT[cand_idx] * np.reciprocal(
+        SUIT_INH[cand_idx] + counts[cand_idx] * pct_scale)
+
+    # Add some noise based on rationality — branchless, so the two RNG
+    # draws happen exactly once per decision regardless of the mask
+    u = rng.random(len(cand_idx))
+    perception_noise = rng.normal(0, (1 - rationality) * 0.1, len(cand_idx))
+    noise_mult = np.where(u > rationality, 1 + perception_noise, 1.0)
+    return ev * noise_mult
+
+
 class Player:
     def __init__(self, id, rationality, risk_tolerance):
         self.id = id
         self.rationality = rationality
         self.risk_tolerance = risk_tolerance
-        
-    def calculate_ev(self, suitcase_idx, current_choices, noise_level):
-        name, multiplier, inhabitants = SUITCASES[suitcase_idx]
-        choice_count = current_choices.count(suitcase_idx)
-        perception_noise = np.random.normal(0, (1 - self.rationality) * noise_level)
-        ev = BASE * multiplier / (inhabitants + choice_count + 1)
-        ev *= (1 + perception_noise)
-        risk_factor = 1 - (choice_count / NUM_PLAYERS) * (1 - self.risk_tolerance)
-        ev *= risk_factor
-        return ev
-        
-    def evaluate_combination(self, combo, all_evs, current_choices):
-        # Calculate total number of suitcase choices for percentage calculation
-        total_choices = len(current_choices) if current_choices else 1  # Avoid division by zero
-        
-        # Calculate total EV for the combination
-        total_ev = 0
-        for idx in combo:
-            # Get base EV
-            name, multiplier, inhabitants = SUITCASES[idx]
-            
-            # Calculate percentage of times this suitcase was chosen
-            times_chosen = current_choices.count(idx)
-            percentage_chosen = (times_chosen / total_choices) if total_choices > 0 else 0
-            
-            # Calculate EV according to the rules
-            ev = BASE * multiplier / (inhabitants + percentage_chosen * 100)
-            
-            # Add some noise based on rationality
-            if np.random.random() > self.rationality:
-                perception_noise = np.random.normal(0, (1 - self.rationality) * 0.1)
-                ev *= (1 + perception_noise)
-            
-            total_ev += ev
-        
-        # Subtract costs based on number of suitcases
-        costs = sum(COSTS[:len(combo)])
-        
-        # Calculate final profit
-        profit = total_ev - costs
-        
-        return profit
-        
-    def choose_suitcases(self, current_choices, noise_level):
-        all_evs = []
-        
-        # Calculate EV for each suitcase
-        for idx in range(len(SUITCASES)):
-            ev = self.calculate_ev(idx, current_choices, noise_level)
-            all_evs.append((idx, ev))
-        
-        # Sort by EV
-        all_evs.sort(key=lambda x: x[1], reverse=True)
-        
+
+    def choose_suitcases(self, counts, total_choices, noise_level, rng):
+        total_choices = total_choices if total_choices else 1  # Avoid division by zero
+
+        # EV for every suitcase in one kernel call
+        evs = _suitcase_evs(counts, self.rationality, self.risk_tolerance,
+                            noise_level, rng)
+
         # Consider top 8 suitcases for combinations
-        top_candidates = [x[0] for x in all_evs[:8]]
-        
-        # Evaluate all possible combinations of 1-3 suitcases
-        best_profit = float('-inf')
-        best_choice = []
-        
-        # Try different sizes of combinations
-        for k in range(1, 4):  # 1 to 3 suitcases
-            for combo in itertools.combinations(top_candidates, k):
-                profit = self.evaluate_combination(combo, all_evs, current_choices)
-                
-                if profit > best_profit:
-                    best_profit = profit
-                    best_choice = list(combo)
-        
-        return best_choice
+        top_candidates = np.argsort(-evs, kind='stable')[:8]
+
+        # Profit of every 1-3 element combination as one padded reduction
+        # over the per-candidate EVs (sentinel slot 8 contributes zero)
+        cand_evs = _candidate_evs(top_candidates, counts, total_choices,
+                                  self.rationality, rng)
+        profits = np.append(cand_evs, 0.0)[COMBO_IDX].sum(axis=1) - COSTS_CUM[COMBO_LEN - 1]
+        best = int(np.argmax(profits))
+
+        return [int(i) for i in top_candidates[COMBO_IDX[best, :COMBO_LEN[best]]]]
+
+# One record per recorded player result; simulations fill a preallocated
+# array of these and ship it back to the parent as a single ndarray
+RESULT_DTYPE = np.dtype([
+    ('simulation', 'i4'), ('noise', 'f4'), ('player_id', 'i4'),
+    ('rationality', 'f4'), ('risk_tolerance', 'f4'),
+    ('combo_mask', 'i8'), ('num_suitcases', 'i1'), ('profit', 'f8'),
+])
+
+
+def _mask_names(mask):
+    """Decode a suitcase bitmask into the display string, e.g. 'A4, C1'."""
+    return ', '.join(sorted(SUITCASES[i][0] for i in range(len(SUITCASES))
+                            if mask >> i & 1))
+
+
+def _results_frame(result_chunks):
+    """One DataFrame from per-simulation record arrays, built in a single pass."""
+    merged = np.concatenate(result_chunks)
+    masks = merged['combo_mask']
+    frame = pd.DataFrame({name: merged[name] for name in merged.dtype.names
+                          if name != 'combo_mask'})
+    # Combinations travel as int64 bitmasks; decode to display names only
+    # once per distinct mask, as the categories of the combination column
+    # (kept in name order so grouped output prints like the string days)
+    codes, uniques = pd.factorize(masks)
+    names = [_mask_names(int(m)) for m in uniques]
+    order = sorted(range(len(names)), key=names.__getitem__)
+    remap = np.empty(len(names), dtype=np.int64)
+    remap[order] = np.arange(len(names))
+    frame['combination'] = pd.Categorical.from_codes(
+        remap[codes], [names[i] for i in order])
+    return frame
+
 
 def run_simulation(sim_id):
-    np.random.seed(sim_id)
-    results = []
+    # Per-simulation PCG64 generator: faster draws than the legacy global
+    # RNG and no shared state between worker processes
+    rng = np.random.default_rng(sim_id)
     noise_levels = [0.05, 0.1, 0.15, 0.2, 0.25]
+    # Results land straight in a preallocated record array — at most one
+    # entry per player per noise level — and the filled slice is returned
+    results = np.empty(NUM_PLAYERS * len(noise_levels), dtype=RESULT_DTYPE)
+    n_out = 0
     
     # Initialize players with varying characteristics
     players = []
     for i in range(NUM_PLAYERS):
-        rationality = np.random.beta(5, 2)  # Most players are somewhat rational
-        risk_tolerance = np.random.beta(2, 2)  # Varied risk tolerance
+        rationality = rng.beta(5, 2)  # Most players are somewhat rational
+        risk_tolerance = rng.beta(2, 2)  # Varied risk tolerance
         players.append(Player(i, rationality, risk_tolerance))
     
     # Run multiple rounds with different noise levels
     for noise in noise_levels:
-        # Initial random assignment
-        current_choices = []
-        
-        # Sequential choice process
-        np.random.shuffle(players)
+        # Running choice tally, updated in place as each player commits;
+        # the EV functions read this instead of rescanning a choice list
+        counts = np.zeros(len(SUITCASES), dtype=np.int64)
+        total_choices = 0
+
+        # Sequential choice process; each player's committed decision is
+        # kept so the accounting pass doesn't re-run the choice search
+        rng.shuffle(players)
+        decisions = []
         for player in players:
-            choices = player.choose_suitcases(current_choices, noise)
-            current_choices.extend(choices)
-        
-        # Calculate final distributions and profits
-        total_choices = len(current_choices)
-        choice_counts = Counter(current_choices)
-        
+            choices = player.choose_suitcases(counts, total_choices, noise, rng)
+            decisions.append((player, choices))
+            for c in choices:
+                counts[c] += 1
+            total_choices += len(choices)
+
         # Record choices and calculate actual profits
-        for player in players:
-            player_choices = [i for i in player.choose_suitcases(current_choices, noise)]
+        pct_scale = 100.0 / total_choices
+        for player, player_choices in decisions:
             if player_choices:
                 # Calculate actual profit
                 total_ev = 0
                 for choice in player_choices:
                     name, multiplier, inhabitants = SUITCASES[choice]
-                    times_chosen = choice_counts[choice]
-                    percentage_chosen = times_chosen / total_choices
-                    ev = BASE * multiplier / (inhabitants + percentage_chosen * 100)
+                    times_chosen = counts[choice]
+                    ev = BASE * multiplier / (inhabitants + times_chosen * pct_scale)
                     total_ev += ev
                 
                 profit = total_ev - sum(COSTS[:len(player_choices)])
-                choice_names = tuple(sorted([SUITCASES[idx][0] for idx in player_choices]))
-                results.append({
-                    'simulation': sim_id,
-                    'noise': noise,
-                    'player_id': player.id,
-                    'rationality': player.rationality,
-                    'risk_tolerance': player.risk_tolerance,
-                    'combination': ', '.join(choice_names),
-                    'num_suitcases': len(player_choices),
-                    'profit': profit
-                })
-    
-    return results, sim_id
+                combo_mask = 0
+                for choice in player_choices:
+                    combo_mask |= 1 << choice
+                results[n_out] = (sim_id, noise, player.id, player.rationality,
+                                  player.risk_tolerance, combo_mask,
+                                  len(player_choices), profit)
+                n_out += 1
 
-def analyze_results(all_results):
-    df = pd.DataFrame(all_results)
-    
+    return results[:n_out], sim_id
+
+def _quantile_bin_means(values, profits, n_bins=5):
+    """Mean profit per quantile bin of values, labelled by bin edges.
+
+    Single-pass bincount replacement for groupby(pd.qcut(...)): quantile
+    edges, digitize, then two weighted bincounts.
+    """
+    edges = np.quantile(values, np.linspace(0, 1, n_bins + 1))
+    bins = np.digitize(values, edges[1:-1])
+    sums = np.bincount(bins, weights=profits, minlength=n_bins)
+    counts = np.bincount(bins, minlength=n_bins)
+    return pd.Series(sums / np.maximum(counts, 1),
+                     index=pd.IntervalIndex.from_breaks(edges), name='profit')
+
+
+def analyze_results(df):
     # Overall best combinations
     best_combos = df.groupby('combination').agg({
         'profit': ['mean', 'std', 'count'],
@@ -201,9 +244,10 @@ def analyze_results(all_results):
     best_combos = best_combos.sort_values('avg_profit', ascending=False)
     
     # Analysis by player characteristics
-    rationality_impact = df.groupby(pd.qcut(df['rationality'], 5))['profit'].mean()
-    risk_impact = df.groupby(pd.qcut(df['risk_tolerance'], 5))['profit'].mean()
-    
+    profits = df['profit'].to_numpy()
+    rationality_impact = _quantile_bin_means(df['rationality'].to_numpy(), profits)
+    risk_impact = _quantile_bin_means(df['risk_tolerance'].to_numpy(), profits)
+
     return best_combos, best_by_num, rationality_impact, risk_impact
 
 def main():
@@ -217,24 +261,21 @@ def main():
     completed = 0
     
     with ProcessPoolExecutor() as executor:
-        futures = [executor.submit(run_simulation, i) for i in range(NUM_SIMULATIONS)]
-        
-        while completed < NUM_SIMULATIONS:
-            newly_completed = [f for f in futures if f.done()]
-            for future in newly_completed:
-                results, sim_id = future.result()
-                all_results.extend(results)
-                futures.remove(future)
-                completed += 1
-                
-                print_progress(completed, NUM_SIMULATIONS,
-                             prefix='Overall Progress:',
-                             suffix=f'({completed}/{NUM_SIMULATIONS} simulations)')
-            
-            time.sleep(0.1)
+        # Batch several simulations per worker dispatch to amortize the
+        # per-task pickling and IPC round-trips
+        chunksize = max(1, NUM_SIMULATIONS // (4 * (os.cpu_count() or 1)))
+        for results, sim_id in executor.map(run_simulation, range(NUM_SIMULATIONS),
+                                            chunksize=chunksize):
+            all_results.append(results)
+            completed += 1
+
+            print_progress(completed, NUM_SIMULATIONS,
+                         prefix='Overall Progress:',
+                         suffix=f'({completed}/{NUM_SIMULATIONS} simulations)')
     
     print("\nAnalyzing results...")
-    best_combos, best_by_num, rationality_impact, risk_impact = analyze_results(all_results)
+    results_df = _results_frame(all_results)
+    best_combos, best_by_num, rationality_impact, risk_impact = analyze_results(results_df)
     
     print("\n=== Best Combinations by Number of Suitcases ===")
     for n in [1, 2, 3]:
@@ -259,8 +300,7 @@ def main():
     for n in [1, 2, 3]:
         top_n_each.extend(best_by_num[n].head(3)['combination'].tolist())
     
-    plot_data = pd.DataFrame(all_results)
-    plot_data = plot_data[plot_data['combination'].isin(top_n_each)]
+    plot_data = results_df[results_df['combination'].isin(top_n_each)]
     sns.boxplot(data=plot_data, x='combination', y='profit', hue='num_suitcases')
     plt.xticks(rotation=45)
     plt.title('Profit Distribution for Top 3 Combinations of Each Size')
@@ -279,7 +319,7 @@ def main():
     plt.savefig('massive_simulation_results.png')
     
     print("\nSaving results to CSV files...")
-    pd.DataFrame(all_results).to_csv('massive_simulation_results.csv', index=False)
+    results_df.to_csv('massive_simulation_results.csv', index=False)
     best_combos.to_csv('massive_simulation_best_combos.csv', index=False)
     
     # Save results by number of suitcases
@@ -7,27 +7,44 @@ sys.path.append(os.path.abspath('/Users/evangray/Desktop/Projects/prosperity/pro
 
 import json
 from mock_datamodel import OrderDepth, TradingState, Order
-from typing import List 
+from typing import List
+
+def _best_bid_ask(order_depth):
+    """Best bid/ask and their volumes in one pass over each book side."""
+    best_bid = bid_volume = None
+    for price, volume in order_depth.buy_orders.items():
+        if best_bid is None or price > best_bid:
+            best_bid, bid_volume = price, volume
+    best_ask = ask_volume = None
+    for price, volume in order_depth.sell_orders.items():
+        if best_ask is None or price < best_ask:
+            best_ask, ask_volume = price, volume
+    return best_bid, bid_volume, best_ask, ask_volume
 
 class Trader:
     def run(self, state: TradingState):
         result = {}
         max_position = 50  # Position limit per product
 
-        # Load previous state from traderData (if available)
-        try:
-            trader_data = json.loads(state.traderData) if state.traderData else {}
-        except Exception:
-            trader_data = {}
+        # Load previous state from traderData (if available); the local
+        # backtest passes a live dict straight through, the platform a
+        # JSON string
+        if isinstance(state.traderData, dict):
+            trader_data = state.traderData
+        else:
+            try:
+                trader_data = json.loads(state.traderData) if state.traderData else {}
+            except Exception:
+                trader_data = {}
 
         # Process each product separately
         for product, order_depth in state.order_depths.items():
             orders: List[Order] = []
             current_position = state.position.get(product, 0)
 
-            # Determine best ask (lowest sell) and best bid (highest buy)
-            best_ask = min(order_depth.sell_orders.keys(), default=None)
-            best_bid = max(order_depth.buy_orders.keys(), default=None)
+            # Determine best ask (lowest sell) and best bid (highest buy),
+            # caching their volumes so the books are scanned once per tick
+            best_bid, bid_volume, best_ask, ask_volume = _best_bid_ask(order_depth)
 
             if best_ask is None and best_bid is None:
                 continue
@@ -60,14 +77,14 @@ class Trader:
 
                 # BUY: If best ask is below historical mean and we have capacity to buy
                 if best_ask is not None and best_ask < historical_mean and available_buy > 0:
-                    order_size = min(available_buy, -order_depth.sell_orders[best_ask])
+                    order_size = min(available_buy, -ask_volume)
                     if order_size > 0:
                         orders.append(Order(product, best_ask, order_size))
                         print(f"--> RAINFOREST_RESIN: Placing BUY order for {order_size} units at {best_ask}", end=";")
                 
                 # SELL: If best bid is above historical mean and we have capacity to sell
                 if best_bid is not None and best_bid > historical_mean and available_sell > 0:
-                    order_size = min(available_sell, order_depth.buy_orders[best_bid])
+                    order_size = min(available_sell, bid_volume)
                     if order_size > 0:
                         orders.append(Order(product, best_bid, -order_size))
                         print(f"--> RAINFOREST_RESIN: Placing SELL order for {order_size} units at {best_bid}", end=";")
@@ -105,14 +122,14 @@ class Trader:
                 if updated_short_ma > updated_long_ma:
                     # Bullish: if best ask is below the short MA, consider buying.
                     if best_ask is not None and best_ask < updated_short_ma and available_buy > 0:
-                        order_size = min(available_buy, -order_depth.sell_orders[best_ask])
+                        order_size = min(available_buy, -ask_volume)
                         if order_size > 0:
                             orders.append(Order(product, best_ask, order_size))
                             print(f"--> KELP: Bullish signal - Placing BUY order for {order_size} units at {best_ask}", end=";")
                 elif updated_short_ma < updated_long_ma:
                     # Bearish: if best bid is above the short MA, consider selling.
                     if best_bid is not None and best_bid > updated_short_ma and available_sell > 0:
-                        order_size = min(available_sell, order_depth.buy_orders[best_bid])
+                        order_size = min(available_sell, bid_volume)
                         if order_size > 0:
                             orders.append(Order(product, best_bid, -order_size))
                             print(f"--> KELP: Bearish signal - Placing SELL order for {order_size} units at {best_bid}", end=";")
@@ -123,7 +140,11 @@ class Trader:
             # If product is neither RAINFOREST_RESIN nor KELP, leave orders empty.
             result[product] = orders
 
-        # Save trader_data as JSON string for the next iteration
-        updated_trader_data = json.dumps(trader_data)
+        # Save trader_data for the next iteration; serialize to JSON only
+        # when the state carried a string (i.e. on the platform)
+        if isinstance(state.traderData, dict):
+            updated_trader_data = trader_data
+        else:
+            updated_trader_data = json.dumps(trader_data)
         conversions = 1
         return result, conversions, updated_trader_data
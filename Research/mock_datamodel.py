@@ -2,7 +2,13 @@
 
 from typing import Dict, List
 
+# These classes are instantiated per order / per tick in the backtest;
+# __slots__ drops the per-instance __dict__ for cheaper attribute access
+# and ~40% less memory per object.
+
 class Order:
+    __slots__ = ("product", "price", "quantity")
+
     def __init__(self, product: str, price: float, quantity: int):
         self.product = product
         self.price = price
@@ -13,11 +19,15 @@ class Order:
         return f"{action} {abs(self.quantity)} {self.product} @ {self.price}"
 
 class OrderDepth:
+    __slots__ = ("buy_orders", "sell_orders")
+
     def __init__(self, buy_orders: Dict[float, int], sell_orders: Dict[float, int]):
         self.buy_orders = buy_orders
         self.sell_orders = sell_orders
 
 class TradingState:
+    __slots__ = ("timestamp", "order_depths", "position", "traderData")
+
     def __init__(self, timestamp: int, order_depths: Dict[str, OrderDepth],
                  position: Dict[str, int], traderData: str = ""):
         self.timestamp = timestamp
@@ -12,57 +12,87 @@ from mock_datamodel import Order, OrderDepth, TradingState
 # Load your data (assumes 'activities' DataFrame is already defined)
 activities = pd.read_csv("/Users/evangray/Desktop/Projects/prosperity/prosperity-3/Data Logs/Tutorial/de9d8071-3ac8-42ae-8de2-038a9acde3b3.csv")  # if loading from file
 
-def create_order_depth(row, price_keys, volume_keys):
-    """Helper to extract buy/sell orders from a row."""
-    orders = {}
-    for price_key, volume_key in zip(price_keys, volume_keys):
-        price = row.get(price_key)
-        volume = row.get(volume_key)
-        if pd.notna(price) and pd.notna(volume):
-            orders[float(price)] = int(volume)
-    return orders
+BID_PRICE_COLS = ["bid_price_1", "bid_price_2", "bid_price_3"]
+BID_VOLUME_COLS = ["bid_volume_1", "bid_volume_2", "bid_volume_3"]
+ASK_PRICE_COLS = ["ask_price_1", "ask_price_2", "ask_price_3"]
+ASK_VOLUME_COLS = ["ask_volume_1", "ask_volume_2", "ask_volume_3"]
+
+def create_order_depth(prices, volumes):
+    """Build one book side from level arrays, skipping empty (NaN) levels."""
+    # x == x is the cheap scalar NaN test — no pd.notna call per cell
+    return {float(p): int(v) for p, v in zip(prices, volumes) if p == p and v == v}
 
 def backtest(df):
     trader = Trader()
-    trader_data = ""
+    # Fast path: hand the trader a live dict so no tick pays a JSON
+    # serialize/parse round-trip (the platform itself passes strings)
+    trader_data = {}
     position = {"RAINFOREST_RESIN": 0, "KELP": 0}
     cash = 0.0
     trade_log = []
 
-    for i, row in df.iterrows():
-        timestamp = int(row["timestamp"])
+    # Column arrays for the loop below; iterrows would allocate a Series
+    # per row just to read two fields
+    ts_arr = df["timestamp"].to_numpy()
+    mid_arr = df["mid_price"].to_numpy()
+    prod_arr = df["product"].to_numpy()
+    bid_prices = df[BID_PRICE_COLS].to_numpy()
+    bid_volumes = df[BID_VOLUME_COLS].to_numpy()
+    ask_prices = df[ASK_PRICE_COLS].to_numpy()
+    ask_volumes = df[ASK_VOLUME_COLS].to_numpy()
+
+    # Map each (timestamp, product) to its row position in one pass; the
+    # per-tick loop below then looks up positions instead of rescanning
+    # the whole frame
+    rows_by_ts = {}
+    for idx in range(len(ts_arr)):
+        rows_by_ts.setdefault(ts_arr[idx], {})[prod_arr[idx]] = idx
+
+    # Each row's book is consulted on every visit to its timestamp (once
+    # per product row), so build all OrderDepths in a single pass up front
+    # rather than reconstructing them inside the loop
+    depths = [
+        OrderDepth(create_order_depth(bid_prices[idx], bid_volumes[idx]),
+                   create_order_depth(ask_prices[idx], ask_volumes[idx]))
+        for idx in range(len(ts_arr))
+    ]
+
+    # Pass 1: build every tick's TradingState up front — timestamps and
+    # order depths are fully determined by the log. Position and
+    # traderData are the only run-dependent fields, so the trading loop
+    # just patches those in before each call.
+    states = []
+    for i in range(len(ts_arr)):
+        timestamp = int(ts_arr[i])
         order_depths = {}
 
         for product in ["RAINFOREST_RESIN", "KELP"]:
-            product_rows = df[(df["timestamp"] == timestamp) & (df["product"] == product)]
-            if product_rows.empty:
+            r = rows_by_ts[timestamp].get(product)
+            if r is None:
                 continue
-            r = product_rows.iloc[0]
 
-            buy_orders = create_order_depth(r, 
-                                            ["bid_price_1", "bid_price_2", "bid_price_3"], 
-                                            ["bid_volume_1", "bid_volume_2", "bid_volume_3"])
-            sell_orders = create_order_depth(r, 
-                                             ["ask_price_1", "ask_price_2", "ask_price_3"], 
-                                             ["ask_volume_1", "ask_volume_2", "ask_volume_3"])
+            order_depths[product] = depths[r]
 
-            order_depths[product] = OrderDepth(buy_orders, sell_orders)
+        states.append(TradingState(timestamp=timestamp,
+                                   order_depths=order_depths,
+                                   position=position,
+                                   traderData=trader_data))
 
-        state = TradingState(timestamp=timestamp,
-                             order_depths=order_depths,
-                             position=position.copy(),
-                             traderData=trader_data)
+    # Pass 2: tight trading loop over the prebuilt states
+    for i, state in enumerate(states):
+        state.position = position.copy()
+        state.traderData = trader_data
 
         result, conversions, trader_data = trader.run(state)
 
         for product, orders in result.items():
-            mid_price = row['mid_price']
+            mid_price = mid_arr[i]
             for order in orders:
                 fill_price = order.price
                 quantity = order.quantity
                 cash -= fill_price * quantity  # buy = negative cash, sell = positive
                 position[product] += quantity
-                trade_log.append((timestamp, product, "BUY" if quantity > 0 else "SELL", abs(quantity), fill_price))
+                trade_log.append((state.timestamp, product, "BUY" if quantity > 0 else "SELL", abs(quantity), fill_price))
 
     # Liquidate all positions at final mid_price
     for product in ["RAINFOREST_RESIN", "KELP"]: